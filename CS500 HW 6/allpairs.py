@@ -0,0 +1,89 @@
+'''
+All-pairs shortest paths on a process pool. The graph is saved once as .npy files that
+every worker memory-maps, so the arrays aren't pickled or copied per worker, and each
+worker writes its rows straight into one n x n distance matrix memory-mapped on disk.
+Sources are handed out in chunks; rows don't depend on each other, so it scales with
+cores until the disk or memory bandwidth runs out.
+'''
+
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from csr import CSRGraph, dijkstra, johnson_reweight
+
+CHUNK = 64  # sources per task
+
+# Set up once per worker process by init_worker
+worker_graph: CSRGraph | None = None
+worker_potential: np.ndarray | None = None
+worker_out: np.memmap | None = None
+
+
+def init_worker(graph_dir: str, out_path: str):
+    global worker_graph, worker_potential, worker_out
+    worker_graph = CSRGraph.load(graph_dir)
+    potential_path = os.path.join(graph_dir, "potential.npy")
+    worker_potential = np.load(potential_path, mmap_mode="r") if os.path.exists(potential_path) else None
+    worker_out = np.load(out_path, mmap_mode="r+")
+
+
+def run_sources(start: int, stop: int) -> int:
+    for s in range(start, stop):
+        row = dijkstra(worker_graph, s)
+        if worker_potential is not None:
+            row += worker_potential - worker_potential[s]  # undo Johnson's reweighting
+        worker_out[s] = row
+    worker_out.flush()
+    return stop - start
+
+
+def all_pairs(graph: CSRGraph, out_path: str, workers: int | None = None, chunk: int = CHUNK,
+              dtype=np.float64) -> np.memmap:
+    '''
+    Distance matrix (row = source) written to out_path as a .npy file and returned
+    memory-mapped read-only. Negative edges are handled with Johnson's reweighting.
+    '''
+    n = graph.num_vertices
+    potential = None
+    if graph.num_edges and graph.weights.min() < 0:
+        graph, potential = johnson_reweight(graph)
+    # Create the output file up front; workers open it themselves
+    np.lib.format.open_memmap(out_path, mode="w+", dtype=dtype, shape=(n, n)).flush()
+
+    with tempfile.TemporaryDirectory() as graph_dir:
+        graph.save(graph_dir)
+        if potential is not None:
+            np.save(os.path.join(graph_dir, "potential.npy"), potential)
+        starts = list(range(0, n, chunk))
+        stops = [min(a + chunk, n) for a in starts]
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(graph_dir, out_path)) as pool:
+            for _ in pool.map(run_sources, starts, stops):
+                pass
+    return np.load(out_path, mmap_mode="r")
+
+
+if __name__ == "__main__":
+    from csr import spfa
+
+    N, M = 10_000, 40_000
+    OUTPUT = "all_pairs.npy"
+    graph = CSRGraph.random(N, M, seed=0)
+    graph = graph.reweighted(np.random.default_rng(1).integers(0, 200, N))  # some negative edges
+    print(f"{N:,} vertices, {M:,} edges ({np.count_nonzero(graph.weights < 0):,} negative), "
+          f"{os.cpu_count()} cores")
+
+    base = None
+    for workers in sorted({1, 2, 4, os.cpu_count()}):
+        if workers > os.cpu_count():
+            continue
+        start = time.perf_counter()
+        dist = all_pairs(graph, OUTPUT, workers=workers, dtype=np.float32)
+        wall = time.perf_counter() - start
+        base = base or wall
+        print(f"{workers:>3} workers: {wall:7.1f} s  ({base / wall:.1f}x)")
+
+    assert np.array_equal(dist[123], spfa(graph, 123).astype(np.float32))
+    print(f"Distance matrix in {OUTPUT} ({os.path.getsize(OUTPUT) / 1e6:.0f} MB)")
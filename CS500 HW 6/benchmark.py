@@ -0,0 +1,49 @@
+import time
+import numpy as np
+from csr import CSRGraph, NegativeCycleError, bellman_ford, dijkstra, johnson, spfa
+
+# Shortest paths on random graphs with millions of edges. Negative-weight versions are
+# made by reweighting with a random potential, which makes some edges negative without
+# creating any negative cycles (every cycle keeps its original, positive, length).
+
+N, M = 1_000_000, 4_000_000
+JOHNSON_N, JOHNSON_M = 1_000, 5_000
+
+
+def timed(label, fn, *args, **kwargs):
+    start = time.perf_counter()
+    out = fn(*args, **kwargs)
+    print(f"{label:<42} {time.perf_counter() - start:>8.2f} s")
+    return out
+
+
+if __name__ == "__main__":
+    print(f"Random graph, {N:,} vertices, {M:,} edges")
+    graph = timed("build CSR", CSRGraph.random, N, M, seed=0)
+    timed("convert to lists (once per graph)", graph.lists)
+    binary = timed("Dijkstra, binary heap (heapq)", dijkstra, graph, 0, "binary")
+    radix = timed("Dijkstra, radix heap", dijkstra, graph, 0, "radix")
+    assert np.array_equal(binary, radix)
+
+    rng = np.random.default_rng(1)
+    negative = graph.reweighted(rng.integers(0, 200, N))
+    print(f"\nSame graph reweighted, {np.count_nonzero(negative.weights < 0):,} negative edges")
+    bf = timed("Bellman-Ford (vectorised rounds)", bellman_ford, negative, 0)
+    sp = timed("SPFA", spfa, negative, 0)
+    assert np.array_equal(bf, sp)
+
+    # One negative cycle is enough to be caught
+    bad = CSRGraph.from_edges(N, np.append(negative.sources(), [1, 2]), np.append(negative.targets, [2, 1]),
+                              np.append(negative.weights, [-1000, -1000]))
+    for label, fn in [("Bellman-Ford, with a negative cycle", bellman_ford), ("SPFA, with a negative cycle", spfa)]:
+        start = time.perf_counter()
+        try:
+            fn(bad, 0)
+        except NegativeCycleError as e:
+            print(f"{label:<42} {time.perf_counter() - start:>8.2f} s  ({e})")
+
+    print(f"\nJohnson all-pairs, {JOHNSON_N:,} vertices, {JOHNSON_M:,} edges")
+    small = CSRGraph.random(JOHNSON_N, JOHNSON_M, seed=2)
+    small = small.reweighted(rng.integers(0, 200, JOHNSON_N))
+    dist = timed("Johnson", johnson, small)
+    assert np.array_equal(dist[7], spfa(small, 7))
@@ -0,0 +1,332 @@
+'''
+Compressed sparse row (CSR) graphs and shortest paths on them. The edges out of vertex u
+are targets[offsets[u]:offsets[u + 1]] with the matching weights, so the whole graph is
+three flat arrays instead of a Node object with a list of tuples per vertex.
+
+  - dijkstra:      non-negative weights only, and it refuses negative ones (main.py's
+                   version re-finalizes nodes instead, which isn't Dijkstra any more)
+  - bellman_ford:  any weights, vectorised with NumPy, raises NegativeCycleError
+  - spfa:          queue-based Bellman-Ford, usually far fewer relaxations on sparse graphs
+  - johnson:       all-pairs with negative edges, Bellman-Ford once then Dijkstra per source
+'''
+
+import heapq
+import os
+from collections import deque
+import numpy as np
+
+INF = float('inf')
+CYCLE_CHECK_ROUNDS = 16  # Bellman-Ford rounds between looks for a negative cycle
+
+
+class NegativeCycleError(ValueError):
+    def __init__(self, cycle: list[int]):
+        super().__init__(f"negative cycle through vertices {cycle}")
+        self.cycle = cycle
+
+
+class CSRGraph:
+    def __init__(self, offsets: np.ndarray, targets: np.ndarray, weights: np.ndarray):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._lists = None
+
+    @classmethod
+    def from_edges(cls, n: int, src, dst, weight) -> "CSRGraph":
+        '''Build from parallel arrays of edge sources, targets and weights.'''
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        weight = np.asarray(weight)
+        weight = weight.astype(np.int64 if np.issubdtype(weight.dtype, np.integer) else np.float64)
+        order = np.argsort(src, kind="stable")  # keep input order within each vertex
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+        return cls(offsets, dst[order], weight[order])
+
+    @classmethod
+    def from_edge_list(cls, edges: list[tuple[int, int, float]], n: int | None = None) -> "CSRGraph":
+        '''Build from (src, dst, weight) tuples. n defaults to one more than the biggest vertex.'''
+        arr = np.array(edges).reshape(-1, 3)
+        src, dst = arr[:, 0].astype(np.int64), arr[:, 1].astype(np.int64)
+        weight = [w for _, _, w in edges]
+        if n is None:
+            n = int(max(src.max(initial=-1), dst.max(initial=-1))) + 1
+        return cls.from_edges(n, src, dst, weight)
+
+    @classmethod
+    def from_nodes(cls, nodes: dict) -> "CSRGraph":
+        '''Build from main.py's {val: Node} dict, vals being 0..n-1.'''
+        return cls.from_edge_list([(u, v.val, w) for u, node in nodes.items() for v, w in node.outgoing], len(nodes))
+
+    @classmethod
+    def read_edge_list(cls, path: str, n: int | None = None) -> "CSRGraph":
+        '''Whitespace-separated "src dst weight" lines; # starts a comment.'''
+        arr = np.loadtxt(path, comments="#", ndmin=2)
+        src, dst = arr[:, 0].astype(np.int64), arr[:, 1].astype(np.int64)
+        weight = arr[:, 2]
+        if np.all(weight == np.round(weight)):
+            weight = weight.astype(np.int64)
+        if n is None:
+            n = int(max(src.max(initial=-1), dst.max(initial=-1))) + 1
+        return cls.from_edges(n, src, dst, weight)
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: str | None = "r") -> "CSRGraph":
+        '''
+        Load a graph written by save(). Memory-mapped by default, so processes loading the
+        same files share one copy of the arrays through the page cache.
+        '''
+        return cls(*(np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+                     for name in ("offsets", "targets", "weights")))
+
+    def save(self, directory: str):
+        for name in ("offsets", "targets", "weights"):
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+
+    @classmethod
+    def random(cls, n: int, m: int, max_weight: int = 100, seed: int | None = None) -> "CSRGraph":
+        '''m random directed edges with integer weights in [1, max_weight].'''
+        rng = np.random.default_rng(seed)
+        return cls.from_edges(n, rng.integers(0, n, m), rng.integers(0, n, m), rng.integers(1, max_weight + 1, m))
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def sources(self) -> np.ndarray:
+        # Source vertex of every edge, in CSR order
+        return np.repeat(np.arange(self.num_vertices), np.diff(self.offsets))
+
+    def reweighted(self, potential: np.ndarray) -> "CSRGraph":
+        # w(u, v) + p(u) - p(v): shortest paths stay shortest, path lengths shift by p(s) - p(t)
+        return CSRGraph(self.offsets, self.targets, self.weights + potential[self.sources()] - potential[self.targets])
+
+    def lists(self) -> tuple:
+        # Plain Python lists for the heap-based loops; indexing NumPy arrays one element
+        # at a time is several times slower than indexing a list. Memory-mapped graphs get
+        # memoryviews instead, which are nearly as quick and don't copy the shared arrays.
+        if self._lists is None:
+            if isinstance(self.offsets, np.memmap):
+                self._lists = (memoryview(self.offsets), memoryview(self.targets), memoryview(self.weights))
+            else:
+                self._lists = (self.offsets.tolist(), self.targets.tolist(), self.weights.tolist())
+        return self._lists
+
+
+class RadixHeap:
+    '''
+    Monotone priority queue for non-negative integer keys, which is what Dijkstra needs:
+    nothing pushed is ever smaller than the last key popped. Bucket i holds keys whose
+    highest bit differing from the last popped key is bit i-1, so each key only moves
+    to a lower bucket, at most ~64 times in total.
+    '''
+    def __init__(self):
+        self.last = 0
+        self.buckets = [[] for _ in range(65)]
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, key: int, item):
+        self.buckets[(key ^ self.last).bit_length()].append((key, item))
+        self.size += 1
+
+    def pop(self):
+        buckets = self.buckets
+        if not buckets[0]:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            bucket = buckets[i]
+            last = self.last = min(bucket)[0]
+            for key, item in bucket:
+                buckets[(key ^ last).bit_length()].append((key, item))
+            bucket.clear()
+        self.size -= 1
+        return buckets[0].pop()
+
+
+def dijkstra(graph: CSRGraph, source: int, heap: str | None = None, order: list | None = None) -> np.ndarray:
+    '''
+    Distances from source (inf where unreachable). heap is "binary" (heapq) or "radix"
+    (integer weights only); by default radix for integer weights, as it's a bit faster.
+    Pass a list as order to have the vertices appended in the order they're finalized.
+    '''
+    if graph.num_edges and graph.weights.min() < 0:
+        raise ValueError("Dijkstra needs non-negative weights, use bellman_ford/spfa/johnson")
+    if heap is None:
+        heap = "radix" if np.issubdtype(graph.weights.dtype, np.integer) else "binary"
+    offsets, targets, weights = graph.lists()
+    dist = [INF] * graph.num_vertices
+    dist[source] = 0
+
+    if heap == "binary":
+        pq = [(0, source)]
+        pop, push = heapq.heappop, heapq.heappush
+        while pq:
+            d, u = pop(pq)
+            if d > dist[u]:
+                continue  # stale entry
+            if order is not None:
+                order.append(u)
+            for k in range(offsets[u], offsets[u + 1]):
+                nd = d + weights[k]
+                v = targets[k]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    push(pq, (nd, v))
+    elif heap == "radix":
+        if not np.issubdtype(graph.weights.dtype, np.integer):
+            raise ValueError("the radix heap needs integer weights")
+        pq = RadixHeap()
+        pq.push(0, source)
+        while pq.size:
+            d, u = pq.pop()
+            if d > dist[u]:
+                continue
+            if order is not None:
+                order.append(u)
+            for k in range(offsets[u], offsets[u + 1]):
+                nd = d + weights[k]
+                v = targets[k]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    pq.push(nd, v)
+    else:
+        raise ValueError(f"unknown heap {heap!r}")
+    return np.array(dist, dtype=np.float64)
+
+
+def parent_cycle(parent: np.ndarray) -> list[int] | None:
+    '''
+    A cycle in the shortest-path parent pointers (-1 = no parent), or None. Any such
+    cycle is a negative cycle. Found by pointer jumping: after at least n steps every
+    vertex has either reached a root or is going round a cycle.
+    '''
+    n = len(parent)
+    roots = parent < 0
+    jump = np.where(roots, np.arange(n), parent)
+    for _ in range(n.bit_length()):
+        jump = jump[jump]
+    on_cycle = ~roots[jump]
+    if not on_cycle.any():
+        return None
+    v = int(jump[on_cycle.argmax()])
+    cycle = [v]
+    u = int(parent[v])
+    while u != v:
+        cycle.append(u)
+        u = int(parent[u])
+    cycle.reverse()
+    return cycle
+
+
+def bellman_ford(graph: CSRGraph, source: int | None = None) -> np.ndarray:
+    '''
+    Distances from source, or with source=None from a virtual vertex joined to every
+    vertex by a 0-weight edge (what Johnson needs). Each round relaxes every edge at once:
+    edges are grouped by target, so the best candidate per vertex is one minimum.reduceat.
+    '''
+    n = graph.num_vertices
+    by_target = np.argsort(graph.targets, kind="stable")
+    src = graph.sources()[by_target]
+    w = graph.weights[by_target].astype(np.float64)
+    tgt = graph.targets[by_target]
+    has_in = np.unique(tgt)
+    starts = np.searchsorted(tgt, has_in)
+
+    dist = np.zeros(n) if source is None else np.full(n, INF)
+    parent = np.full(n, -1, dtype=np.int64)
+    if source is not None:
+        dist[source] = 0
+    if not len(tgt):
+        return dist
+    for rounds in range(1, n + 1):
+        cand = dist[src] + w
+        best = np.minimum.reduceat(cand, starts)
+        better = best < dist[has_in]
+        if not better.any():
+            return dist
+        improved = has_in[better]
+        dist[improved] = best[better]
+        # Whichever incoming edge gave the minimum becomes the parent
+        winner = np.full(n, -1, dtype=np.int64)
+        hit = cand == dist[tgt]
+        winner[tgt[hit]] = src[hit]
+        parent[improved] = winner[improved]
+        # Proving a negative cycle takes n rounds, but one usually shows up in the parent
+        # pointers long before that, so look every so often
+        if rounds % CYCLE_CHECK_ROUNDS == 0 and (cycle := parent_cycle(parent)):
+            raise NegativeCycleError(cycle)
+    # Still improving after n rounds: there's a negative cycle
+    raise NegativeCycleError(parent_cycle(parent))
+
+
+def spfa(graph: CSRGraph, source: int) -> np.ndarray:
+    '''
+    Bellman-Ford with a queue of vertices whose distance changed, so only their edges
+    get relaxed. Negative cycles are caught the same way as in bellman_ford, or at the
+    latest when some vertex's best path reaches n edges.
+    '''
+    n = graph.num_vertices
+    offsets, targets, weights = graph.lists()
+    dist = [INF] * n
+    length = [0] * n  # edges on the current best path
+    parent = [-1] * n
+    queued = bytearray(n)
+    dist[source] = 0
+    queue = deque([source])
+    queued[source] = 1
+    relaxations = 0
+    while queue:
+        u = queue.popleft()
+        queued[u] = 0
+        du = dist[u]
+        for k in range(offsets[u], offsets[u + 1]):
+            v = targets[k]
+            nd = du + weights[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                parent[v] = u
+                length[v] = length[u] + 1
+                relaxations += 1
+                # Same idea as Bellman-Ford: check the parent pointers every n relaxations,
+                # which costs O(1) per relaxation overall
+                if length[v] >= n or relaxations % n == 0:
+                    cycle = parent_cycle(np.array(parent))
+                    if cycle:
+                        raise NegativeCycleError(cycle)
+                if not queued[v]:
+                    queued[v] = 1
+                    queue.append(v)
+    return np.array(dist, dtype=np.float64)
+
+
+def johnson_reweight(graph: CSRGraph) -> tuple[CSRGraph, np.ndarray]:
+    '''
+    Johnson's trick: Bellman-Ford potentials p make every w(u, v) + p(u) - p(v) >= 0, so
+    Dijkstra can run on the reweighted graph. Undo with d(s, t) = d'(s, t) - p(s) + p(t).
+    '''
+    potential = bellman_ford(graph)
+    positive = graph.reweighted(potential)
+    if np.issubdtype(graph.weights.dtype, np.integer):
+        positive.weights = positive.weights.astype(np.int64)
+    else:
+        np.maximum(positive.weights, 0, out=positive.weights)  # rounding can leave tiny negatives
+    return positive, potential
+
+
+def johnson(graph: CSRGraph, heap: str | None = None) -> np.ndarray:
+    '''All-pairs distances as an n x n array, negative edges allowed (not negative cycles).'''
+    n = graph.num_vertices
+    positive, potential = johnson_reweight(graph)
+    out = np.empty((n, n))
+    for s in range(n):
+        out[s] = dijkstra(positive, s, heap) - potential[s] + potential
+    return out
@@ -1,4 +1,5 @@
 import heapq
+from csr import CSRGraph, bellman_ford
 
 
 class Node:
@@ -11,7 +12,7 @@ class Node:
         return str(self.val)
 
 
-def dijkstra_with_tracking(root, all_nodes):
+def dijkstra_with_tracking(root, all_nodes, track_order=True):
     # Initialize distances
     distances = {node: float('inf') for node in all_nodes.values()}
     distances[root] = 0
@@ -19,8 +20,8 @@ def dijkstra_with_tracking(root, all_nodes):
     # Priority Queue: (distance, node_val)
     pq = [(0, root.val)]
 
-    # List to track the order nodes are popped/finalized
-    finalization_order = []
+    # List to track the order nodes are popped/finalized (None if not tracking)
+    finalization_order = [] if track_order else None
 
     while pq:
         current_dist, current_val = heapq.heappop(pq)
@@ -31,7 +32,8 @@ def dijkstra_with_tracking(root, all_nodes):
             continue
 
         # Record this node as being finalized
-        finalization_order.append(current_node.val)
+        if track_order:
+            finalization_order.append(current_node.val)
 
         # Explore neighbors
         for neighbor, weight in current_node.outgoing:
@@ -82,4 +84,12 @@ if __name__ == "__main__":
     # Formatting simply as requested
     for node_val in sorted([n.val for n in final_distances]):
         node = nodes[node_val]
-        print(f"Node {node}: {final_distances[node]}")
\ No newline at end of file
+        print(f"Node {node}: {final_distances[node]}")
+
+    # The -13 edge makes this loop finalize nodes 4, 3, 2, 1 a second time (see the order
+    # above). That happens to give the right answers here, but it's no longer Dijkstra:
+    # with negative edges the re-finalizing can take exponential time. Bellman-Ford is
+    # what negative edges need, and stops with an error on a negative cycle.
+    print("\nCorrect distances (Bellman-Ford on the CSR graph):")
+    for node_val, dist in enumerate(bellman_ford(CSRGraph.from_nodes(nodes), root.val)):
+        print(f"Node {node_val}: {dist:g}")
@@ -0,0 +1,143 @@
+import csv
+import functools
+import gc
+import math
+import os
+import platform
+import statistics
+import time
+from datetime import datetime
+import numpy as np
+from quicksort import QuickSort
+from standardsort import StandardSort
+from naivesort import NaiveSort
+from radixsort import RadixSort
+
+# Timing harness for the sorts. Every (sort, input, size) cell gets a warm-up run
+# (also used to check the output is sorted), then repeated trials timed with
+# perf_counter_ns with the garbage collector off, and is reported as median and IQR.
+# Rows are appended to OUTPUT along with when and where they were run, and each cell
+# is compared against the last time it was recorded, so regressions show up.
+
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+TRIALS = 15              # most trials per cell...
+MIN_TRIALS = 3           # ...but at least this many...
+CELL_BUDGET_S = 5        # ...once the trials of a cell have taken this long
+MAX_TRIAL_S = 60         # skip a size if one trial is predicted to take longer than this
+FEW_UNIQUE = 10          # distinct values in the "few unique" input
+SEED = 42
+OUTPUT = "benchmark_results.csv"
+
+SORTS = {
+    "QuickSort": QuickSort,
+    "QuickSort (intro)": functools.partial(QuickSort, mode="intro"),
+    "StandardSort": StandardSort,
+    "NaiveSort": NaiveSort,
+    "NaiveSort (heap)": functools.partial(NaiveSort, mode="heap"),
+    "RadixSort": RadixSort,
+}
+
+DISTRIBUTIONS = {
+    "random": lambda n, rng: rng.integers(0, n, n).tolist(),
+    "sorted": lambda n, rng: list(range(n)),
+    "reversed": lambda n, rng: list(range(n, 0, -1)),
+    "few unique": lambda n, rng: rng.integers(0, FEW_UNIQUE, n).tolist(),
+    "organ pipe": lambda n, rng: np.minimum(np.arange(n), np.arange(n)[::-1]).tolist(),  # 0 1 2 .. 2 1 0
+}
+
+COLUMNS = ["run", "python", "machine", "algorithm", "distribution", "n", "trials",
+           "median_ms", "q1_ms", "q3_ms", "iqr_ms", "min_ms", "status"]
+
+
+def time_sort(make_sorter, data: list[int]) -> tuple[int, list[int]]:
+    sorter = make_sorter(data.copy())  # copied outside the timed part
+    gc_was_on = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter_ns()
+        out = sorter.sort()
+        elapsed = time.perf_counter_ns() - start
+    finally:
+        if gc_was_on:
+            gc.enable()
+    return elapsed, out
+
+
+def measure(make_sorter, data: list[int]) -> list[int]:
+    '''
+    One warm-up run, then trials until TRIALS are done or the cell has used up
+    CELL_BUDGET_S (but never fewer than MIN_TRIALS). Returns the trial times in ns.
+    '''
+    _, out = time_sort(make_sorter, data)
+    if out != sorted(data):
+        raise AssertionError("the output isn't sorted")
+    times: list[int] = []
+    while len(times) < TRIALS and (len(times) < MIN_TRIALS or sum(times) < CELL_BUDGET_S * 1e9):
+        times.append(time_sort(make_sorter, data)[0])
+    return times
+
+
+def predicted_s(history: list[tuple[int, float]], n: int) -> float:
+    # Extrapolate from the last two sizes with the growth exponent they show
+    if len(history) < 2:
+        return 0.0
+    (n0, t0), (n1, t1) = history[-2:]
+    slope = max(math.log(t1 / t0) / math.log(n1 / n0), 1.0)
+    return t1 * (n / n1) ** slope
+
+
+def previous_medians(path: str) -> dict[tuple[str, str, int], float]:
+    # The most recent median for every cell already in the CSV
+    if not os.path.exists(path):
+        return {}
+    with open(path, newline="") as f:
+        return {(row["algorithm"], row["distribution"], int(row["n"])): float(row["median_ms"])
+                for row in csv.DictReader(f) if row["status"] == "ok"}
+
+
+if __name__ == "__main__":
+    run = datetime.now().isoformat(timespec="seconds")
+    base = {"run": run, "python": platform.python_version(), "machine": platform.node()}
+    previous = previous_medians(OUTPUT)
+
+    new_file = not os.path.exists(OUTPUT)
+    with open(OUTPUT, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        if new_file:
+            writer.writeheader()
+
+        print(f"{'algorithm':>17} {'input':>10} {'n':>11} {'trials':>6} {'median ms':>11} {'IQR ms':>10} "
+              f"{'min ms':>11} {'vs last':>8}")
+        for dist_name, make in DISTRIBUTIONS.items():
+            for name, make_sorter in SORTS.items():
+                history: list[tuple[int, float]] = []
+                for n in SIZES:
+                    row = dict(base, algorithm=name, distribution=dist_name, n=n)
+                    estimate = predicted_s(history, n)
+                    if estimate > MAX_TRIAL_S:
+                        print(f"{name:>17} {dist_name:>10} {n:>11,}  skipped, about {estimate:,.0f} s a trial")
+                        break
+                    data = make(n, np.random.default_rng(SEED))
+                    try:
+                        times = measure(make_sorter, data)
+                    except RecursionError:
+                        # the recursive QuickSort goes n deep on its worst-case inputs
+                        writer.writerow(dict(row, trials=0, status="recursion limit"))
+                        print(f"{name:>17} {dist_name:>10} {n:>11,}  hit the recursion limit")
+                        break
+
+                    ms = [t / 1e6 for t in times]
+                    median = statistics.median(ms)
+                    q1, _, q3 = statistics.quantiles(ms, n=4, method="inclusive")
+                    writer.writerow(dict(row, trials=len(ms), median_ms=round(median, 6), q1_ms=round(q1, 6),
+                                         q3_ms=round(q3, 6), iqr_ms=round(q3 - q1, 6), min_ms=round(min(ms), 6),
+                                         status="ok"))
+                    f.flush()
+                    history.append((n, median / 1000))
+
+                    last = previous.get((name, dist_name, n))
+                    change = f"{median / last:>7.2f}x" if last else f"{'-':>8}"
+                    print(f"{name:>17} {dist_name:>10} {n:>11,} {len(ms):>6} {median:>11.3f} {q3 - q1:>10.3f} "
+                          f"{min(ms):>11.3f} {change}")
+
+    print(f"Appended to {OUTPUT}")
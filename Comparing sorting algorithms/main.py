@@ -1,6 +1,7 @@
 from quicksort import QuickSort
 from standardsort import StandardSort
 from naivesort import NaiveSort
+from radixsort import RadixSort
 import random as r
 import matplotlib.pyplot as plt
 
@@ -13,11 +14,13 @@ if __name__ == "__main__":
     qs_times: list[float] = []
     std_times: list[float] = []
     naive_times: list[float] = []
+    radix_times: list[float] = []
 
     for i in range(low, high, step):
         qs_total: float = 0.0
         std_total: float = 0.0
         naive_total: float = 0.0
+        radix_total: float = 0.0
 
         for _ in range(NUM_TRIALS):
             randlist = [r.randint(1, 10000) for _ in range(i)]
@@ -34,9 +37,14 @@ if __name__ == "__main__":
             naivesort.sort(True)
             naive_total += naivesort.return_time_taken()*1000 
 
+            radixsort = RadixSort(randlist.copy())
+            radixsort.sort(True)
+            radix_total += radixsort.return_time_taken()*1000
+
         qs_times.append(qs_total / NUM_TRIALS)
         std_times.append(std_total / NUM_TRIALS)
         naive_times.append(naive_total / NUM_TRIALS)
+        radix_times.append(radix_total / NUM_TRIALS)
 
         print(f"{i}/{high}")
 
@@ -46,6 +54,7 @@ if __name__ == "__main__":
     ax.plot(range(low, high, step), qs_times, label="QuickSort", linewidth=2.5, color='#1f77b4', marker='o', markersize=4) # type: ignore 
     ax.plot(range(low, high, step), std_times, label="StandardSort", linewidth=2.5, color='#ff7f0e', marker='s', markersize=4) # type: ignore 
     ax.plot(range(low, high, step), naive_times, label="NaiveSort", linewidth=2.5, color='#2ca02c', marker='^', markersize=4) # type: ignore 
+    ax.plot(range(low, high, step), radix_times, label="RadixSort", linewidth=2.5, color='#d62728', marker='d', markersize=4) # type: ignore 
 
     ax.set_yscale('log') # type: ignore 
     ax.set_xlabel('List Size', fontsize=16, fontweight='bold', color='#333333') # type: ignore 
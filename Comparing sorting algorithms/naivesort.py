@@ -1,47 +1,149 @@
+import heapq
+import itertools
 import time
 
 class NaiveSort():
     '''
     A very naive sorting method where the minimum value of the array is recursively
     added to a new list and removed from the original.
+
+    mode="naive" does exactly that, with two O(n) scans (min and remove) per element.
+    mode="heap" and mode="tournament" keep the same "take out the minimum, repeat"
+    idea, but keep the remaining values in a binary heap or a tournament tree, so each
+    extraction is O(log n) and the whole sort O(n log n).
     '''
-    def __init__(self, arr: list[int]):
+    def __init__(self, arr: list[int], mode: str = "naive"):
+        if mode not in ("naive", "heap", "tournament"):
+            raise ValueError(f"unknown mode {mode!r}")
         self.arr: list[int] = arr
+        self.mode: str = mode
         self.time_taken: float = -1
 
-        
-    def sort(self, timerOn: bool = False, printOn: bool = False) -> list[int]:
-        unsorted: list[int] = self.arr.copy()
-        sorted_list: list[int] = []
 
-        start: float = 0.0
+    def sort(self, timerOn: bool = False, printOn: bool = False) -> list[int]:
+        start: int = 0
 
         if timerOn:
-            start = time.time()
+            start = time.perf_counter_ns()
 
-        while unsorted:
-            curr_min = min(unsorted)
-            sorted_list.append(curr_min)
-            unsorted.remove(curr_min)
+        if self.mode == "heap":
+            sorted_list = list(self.iter_smallest())
+        elif self.mode == "tournament":
+            sorted_list = self._tournament_sort()
+        else:
+            sorted_list = self._naive_sort()
 
         if timerOn:
-            self.time_taken = time.time() - start
+            self.time_taken = (time.perf_counter_ns() - start) / 1e9
 
         if printOn:
             print(sorted_list)
 
         return sorted_list
-    
+
     def return_time_taken(self) -> float:
         if self.time_taken == -1.0:
             raise ValueError("no calculations yet!")
         else:
             return self.time_taken
 
+    def iter_smallest(self):
+        '''
+        Yields the values from smallest up, lazily: heapify is O(n) and each value after
+        that costs O(log n), so taking the first k is O(n + k log n) and the rest of the
+        list never gets sorted.
+        '''
+        heap: list[int] = self.arr.copy()
+        heapq.heapify(heap)
+        while heap:
+            yield heapq.heappop(heap)
+
+    def k_smallest(self, k: int) -> list[int]:
+        return list(itertools.islice(self.iter_smallest(), k))
+
+    def _naive_sort(self) -> list[int]:
+        unsorted: list[int] = self.arr.copy()
+        sorted_list: list[int] = []
+
+        while unsorted:
+            curr_min = min(unsorted)
+            sorted_list.append(curr_min)
+            unsorted.remove(curr_min)
+
+        return sorted_list
+
+    def _tournament_sort(self) -> list[int]:
+        # A knockout tournament over the values: the leaves are the values, each
+        # internal node holds the index of the smaller of its two children, so the root is
+        # the minimum. Taking it out empties its leaf (-1) and only the matches on the way
+        # back up to the root are replayed.
+        values = self.arr
+        n = len(values)
+        if n == 0:
+            return []
+        size = 1 << (n - 1).bit_length()
+        tree = [-1] * (2 * size)
+        tree[size:size + n] = range(n)
+        for i in range(size - 1, 0, -1):
+            a, b = tree[2 * i], tree[2 * i + 1]
+            tree[i] = a if b < 0 or (a >= 0 and values[a] <= values[b]) else b
+
+        sorted_list: list[int] = []
+        for _ in range(n):
+            winner = tree[1]
+            sorted_list.append(values[winner])
+            i = size + winner
+            tree[i] = -1
+            i //= 2
+            while i:
+                a, b = tree[2 * i], tree[2 * i + 1]
+                tree[i] = a if b < 0 or (a >= 0 and values[a] <= values[b]) else b
+                i //= 2
+        return sorted_list
+
 
 
 if __name__ == "__main__":
+    import random
+    import matplotlib.pyplot as plt
+
     ns = NaiveSort([5,2,6,2,6])
     print(ns.sort())
-    
 
+    # The original against the two O(n log n) modes, plus just the 10 smallest
+    sizes = [100, 300, 1_000, 3_000, 10_000, 30_000, 100_000, 300_000, 1_000_000]
+    NAIVE_LIMIT = 30_000  # min/remove is O(n^2), so it stops here
+    K = 10
+    times: dict[str, list[float]] = {"naive": [], "heap": [], "tournament": [], f"{K} smallest (lazy)": []}
+
+    for n in sizes:
+        randlist = [random.randint(1, 10000) for _ in range(n)]
+        expected = sorted(randlist)
+        row: dict[str, float] = {}
+        for mode in ("naive", "heap", "tournament"):
+            if mode == "naive" and n > NAIVE_LIMIT:
+                continue
+            sorter = NaiveSort(randlist, mode)
+            assert sorter.sort(True) == expected
+            row[mode] = sorter.return_time_taken() * 1000
+
+        start = time.perf_counter_ns()
+        smallest = NaiveSort(randlist).k_smallest(K)
+        row[f"{K} smallest (lazy)"] = (time.perf_counter_ns() - start) / 1e6
+        assert smallest == expected[:K]
+
+        for name, ms in row.items():
+            times[name].append(ms)
+        print(f"{n:>9,}  " + "  ".join(f"{name}: {ms:9.2f} ms" for name, ms in row.items()))
+
+    fig, ax = plt.subplots(figsize=(10, 6)) # type: ignore
+    for (name, ms), marker in zip(times.items(), "o^sd"):
+        ax.plot(sizes[:len(ms)], ms, label=name, marker=marker) # type: ignore
+    ax.set_xscale('log') # type: ignore
+    ax.set_yscale('log') # type: ignore
+    ax.set_xlabel('List Size') # type: ignore
+    ax.set_ylabel('Milliseconds Taken') # type: ignore
+    ax.set_title('Repeatedly taking the minimum: min/remove vs heap vs tournament tree') # type: ignore
+    ax.legend() # type: ignore
+    plt.tight_layout()
+    plt.show() # type: ignore
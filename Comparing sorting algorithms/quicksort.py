@@ -1,27 +1,45 @@
 import time
 
+INSERTION_CUTOFF = 16   # ranges this short are finished with insertion sort
+NINTHER_CUTOFF = 40     # ranges longer than this pick the pivot with Tukey's ninther
+
 class QuickSort():
-    def __init__(self, arr: list[int]):
+    '''
+    mode="classic" is the original recursive quicksort with a last-element Lomuto
+    pivot. mode="intro" is an introsort: iterative, with a median-of-three / ninther
+    pivot, a three-way partition, insertion sort for short ranges and a heapsort
+    fallback, so it stays O(n log n) on sorted and duplicate-heavy input too.
+    '''
+    def __init__(self, arr: list[int], mode: str = "classic"):
+        if mode not in ("classic", "intro"):
+            raise ValueError(f"unknown mode {mode!r}")
         self.arr: list[int] = arr
+        self.mode: str = mode
         self.time_taken: float = -1
-        
+
     def sort(self, timerOn:bool = False, printOn:bool = False) -> list[int]:
         if timerOn:
-            start = time.time()
-            self._qsort_recursive(0, len(self.arr)-1)
-            self.time_taken = time.time() - start
+            start = time.perf_counter_ns()
+            self._run()
+            self.time_taken = (time.perf_counter_ns() - start) / 1e9
         else:
-            self._qsort_recursive(0, len(self.arr)-1)
+            self._run()
         if printOn:
             print(self.arr)
         return self.arr
-    
+
     def return_time_taken(self) -> float:
         if self.time_taken == -1.0:
             raise ValueError("no calculations yet!")
         else:
             return self.time_taken
 
+    def _run(self) -> None:
+        if self.mode == "intro":
+            self._introsort()
+        else:
+            self._qsort_recursive(0, len(self.arr)-1)
+
     def _qsort_recursive(self, low: int, high: int) -> None:
         if low < high:
             pi = self._partition(low, high)
@@ -38,4 +56,99 @@ class QuickSort():
         self.arr[i+1],self.arr[high] = self.arr[high], self.arr[i+1]
         return i + 1
 
+    # --- mode="intro" ---
+
+    def _introsort(self) -> None:
+        if len(self.arr) < 2:
+            return
+        # (low, high, splits left before giving up on quicksort for this range)
+        stack = [(0, len(self.arr) - 1, 2 * len(self.arr).bit_length())]
+        while stack:
+            low, high, depth = stack.pop()
+            if high - low < INSERTION_CUTOFF:
+                self._insertion_sort(low, high)
+                continue
+            if depth == 0:
+                # the pivots keep coming out lopsided, so this range gets heapsorted
+                self._heapsort(low, high)
+                continue
+            lt, gt = self._partition3(low, high, self._choose_pivot(low, high))
+            # Push the bigger side first so the smaller one is done next, which keeps the
+            # stack at O(log n) entries
+            if lt - low < high - gt:
+                stack.append((gt + 1, high, depth - 1))
+                stack.append((low, lt - 1, depth - 1))
+            else:
+                stack.append((low, lt - 1, depth - 1))
+                stack.append((gt + 1, high, depth - 1))
+
+    def _median3(self, i: int, j: int, k: int) -> int:
+        a, b, c = self.arr[i], self.arr[j], self.arr[k]
+        if a < b:
+            return b if b < c else (c if a < c else a)
+        return a if a < c else (c if b < c else b)
+
+    def _choose_pivot(self, low: int, high: int) -> int:
+        mid = (low + high) // 2
+        if high - low < NINTHER_CUTOFF:
+            return self._median3(low, mid, high)
+        # Tukey's ninther: the median of three medians of three, spread over the range
+        step = (high - low) // 8
+        return sorted([self._median3(low, low + step, low + 2 * step),
+                       self._median3(mid - step, mid, mid + step),
+                       self._median3(high - 2 * step, high - step, high)])[1]
+
+    def _partition3(self, low: int, high: int, pivot: int) -> tuple[int, int]:
+        '''
+        Dutch national flag partition: afterwards arr[low:lt] < pivot, arr[lt:gt+1] ==
+        pivot and arr[gt+1:high+1] > pivot. Returns (lt, gt). Keys equal to the pivot are
+        in their final place, so lots of duplicates make the ranges shrink faster.
+        '''
+        arr = self.arr
+        lt, i, gt = low, low, high
+        while i <= gt:
+            v = arr[i]
+            if v < pivot:
+                arr[lt], arr[i] = v, arr[lt]
+                lt += 1
+                i += 1
+            elif v > pivot:
+                arr[i], arr[gt] = arr[gt], v
+                gt -= 1
+            else:
+                i += 1
+        return lt, gt
+
+    def _insertion_sort(self, low: int, high: int) -> None:
+        arr = self.arr
+        for i in range(low + 1, high + 1):
+            v = arr[i]
+            j = i - 1
+            while j >= low and arr[j] > v:
+                arr[j + 1] = arr[j]
+                j -= 1
+            arr[j + 1] = v
+
+    def _heapsort(self, low: int, high: int) -> None:
+        arr = self.arr
+        n = high - low + 1
+
+        def sift_down(root: int, end: int) -> None:
+            # max-heap over arr[low:low+end], positions relative to low
+            v = arr[low + root]
+            child = 2 * root + 1
+            while child < end:
+                if child + 1 < end and arr[low + child + 1] > arr[low + child]:
+                    child += 1
+                if arr[low + child] <= v:
+                    break
+                arr[low + root] = arr[low + child]
+                root = child
+                child = 2 * root + 1
+            arr[low + root] = v
 
+        for root in range(n // 2 - 1, -1, -1):
+            sift_down(root, n)
+        for end in range(n - 1, 0, -1):
+            arr[low], arr[low + end] = arr[low + end], arr[low]
+            sift_down(0, end)
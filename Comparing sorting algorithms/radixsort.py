@@ -0,0 +1,68 @@
+import time
+import numpy as np
+
+COUNTING_MAX_SPAN = 1 << 16   # key ranges up to this wide (or up to 2n) use counting sort
+DIGIT_BITS = 16               # bits per LSD radix pass
+
+class RadixSort():
+    '''
+    A non-comparison sort for integers (anything that fits in an int64). A narrow range
+    of keys is counting sorted: count each value with np.bincount and write each one
+    back out that many times. A wide range is LSD radix sorted on 16-bit digits,
+    least significant first. Each pass is a stable argsort of one digit, which NumPy
+    does as a radix pass of its own. Anything else (floats, strings, ints too big for
+    an int64) raises a TypeError and the list is left as it was.
+    '''
+    def __init__(self, arr: list[int]):
+        self.arr: list[int] = arr
+        self.time_taken: float = -1
+        self.method: str = ""   # "counting" or "radix", once sorted
+
+    def sort(self, timerOn: bool = False, printOn: bool = False) -> list[int]:
+        if timerOn:
+            start = time.perf_counter_ns()
+            self._sort()
+            self.time_taken = (time.perf_counter_ns() - start) / 1e9
+        else:
+            self._sort()
+        if printOn:
+            print(self.arr)
+        return self.arr
+
+    def return_time_taken(self) -> float:
+        if self.time_taken == -1.0:
+            raise ValueError("no calculations yet!")
+        else:
+            return self.time_taken
+
+    def _sort(self) -> None:
+        if len(self.arr) < 2:
+            return
+        # Let NumPy pick the dtype rather than forcing int64, which would quietly cut
+        # floats down to ints (and write them back over the caller's list)
+        keys = np.array(self.arr)
+        if keys.dtype.kind != "i":
+            raise TypeError(f"RadixSort only sorts integers that fit in an int64, not {keys.dtype} data")
+        low = int(keys.min())
+        span = int(keys.max()) - low + 1
+        if span <= max(COUNTING_MAX_SPAN, 2 * len(keys)):
+            self.method = "counting"
+            out = self._counting_sort(keys, low, span)
+        else:
+            self.method = "radix"
+            out = self._radix_sort(keys, low, span)
+        self.arr[:] = out.tolist()
+
+    def _counting_sort(self, keys: np.ndarray, low: int, span: int) -> np.ndarray:
+        counts = np.bincount(keys - low, minlength=span)
+        return np.repeat(np.arange(low, low + span, dtype=np.int64), counts)
+
+    def _radix_sort(self, keys: np.ndarray, low: int, span: int) -> np.ndarray:
+        # Subtracting the minimum makes every key non-negative (wrapping around is fine,
+        # the unsigned view still comes out right), so the digits sort like the numbers
+        shifted = (keys - np.int64(low)).view(np.uint64)
+        mask = np.uint64((1 << DIGIT_BITS) - 1)
+        for shift in range(0, (span - 1).bit_length(), DIGIT_BITS):
+            digit = ((shifted >> np.uint64(shift)) & mask).astype(np.uint16)
+            shifted = shifted[np.argsort(digit, kind="stable")]
+        return shifted.view(np.int64) + np.int64(low)
@@ -11,10 +11,11 @@ class StandardSort():
         
     def sort(self, timerOn:bool = False, printOn:bool = False) -> list[int]:
         if timerOn:
-            start = time.time()
+            start = time.perf_counter_ns()
+            self.arr.sort()
+            self.time_taken = (time.perf_counter_ns() - start) / 1e9
+        else:
             self.arr.sort()
-            self.time_taken = time.time() - start
-        self.arr.sort()
         if printOn:
             print(self.arr)
         return self.arr
@@ -0,0 +1,70 @@
+import csv
+import gc
+import time
+import tracemalloc
+from main import (Node, SlotNode, bfs_adjacency, bfs_csr, bfs_objects, build_adjacency, build_csr, build_objects,
+                  dfs_adjacency, dfs_csr, dfs_objects, grid_graph, random_graph, scale_free_graph)
+
+# Builds random, grid and scale-free graphs of increasing size, then for each
+# representation reports construction time, memory per edge (tracemalloc, in a separate
+# build since tracing slows things down) and BFS/DFS time from vertex 0.
+
+SIZES = [10_000, 100_000, 1_000_000]
+OUTPUT = "benchmark_results.csv"
+
+GRAPHS = {
+    "random": lambda n: random_graph(n, avg_degree=6, seed=0),
+    "grid": lambda n: grid_graph(round(n ** 0.5)),
+    "scale-free": lambda n: scale_free_graph(n, m=3, seed=0),
+}
+
+# name: (build(n, src, dst), bfs(graph), dfs(graph))
+REPRESENTATIONS = {
+    "objects": (build_objects, lambda g: bfs_objects(g[0]), lambda g: dfs_objects(g[0])),
+    "slots": (lambda n, s, d: build_objects(n, s, d, SlotNode), lambda g: bfs_objects(g[0]), lambda g: dfs_objects(g[0])),
+    "int lists": (build_adjacency, lambda g: bfs_adjacency(g, 0), lambda g: dfs_adjacency(g, 0)),
+    "csr": (build_csr, lambda g: bfs_csr(*g, 0), lambda g: dfs_csr(*g, 0)),
+}
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    assert hash(Node(1)) == hash(Node(1)) and len({Node(1), Node(1)}) == 1
+
+    rows = []
+    print(f"{'graph':>10} {'nodes':>9} {'edges':>9} {'repr':>9} {'build s':>8} {'B/edge':>7} "
+          f"{'BFS s':>7} {'DFS s':>7} {'reached':>9}")
+    for kind, make in GRAPHS.items():
+        for size in SIZES:
+            n, src, dst = make(size)
+            for name, (build, bfs, dfs) in REPRESENTATIONS.items():
+                gc.collect()
+                graph, build_s = timed(build, n, src, dst)
+                (reached, bfs_s), (reached_dfs, dfs_s) = timed(bfs, graph), timed(dfs, graph)
+                assert reached == reached_dfs
+                del graph
+                gc.collect()
+
+                tracemalloc.start()
+                graph = build(n, src, dst)
+                bytes_used = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+                del graph
+
+                row = {"graph": kind, "nodes": n, "edges": len(src), "representation": name,
+                       "build_s": round(build_s, 4), "bytes_per_edge": round(bytes_used / len(src), 1),
+                       "bfs_s": round(bfs_s, 4), "dfs_s": round(dfs_s, 4), "reached": reached}
+                rows.append(row)
+                print(f"{kind:>10} {n:>9,} {len(src):>9,} {name:>9} {build_s:>8.3f} {row['bytes_per_edge']:>7.0f} "
+                      f"{bfs_s:>7.3f} {dfs_s:>7.3f} {reached:>9,}")
+
+    with open(OUTPUT, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Saved to {OUTPUT}")
@@ -1,5 +1,18 @@
+'''
+The same undirected graph stored four ways, to see what the representation costs when
+traversing it:
+  - Node objects, each with a __dict__ and a list of neighbouring Nodes
+  - SlotNode objects, same but with __slots__ (no per-object dict)
+  - integer adjacency lists, adj[u] is a list of vertex numbers
+  - CSR arrays, the neighbours of u are targets[offsets[u]:offsets[u + 1]]
+Graphs are generated as NumPy edge arrays (src, dst) and every representation is built
+from those, so they all hold exactly the same edges.
+'''
+
 import random
-import time
+from collections import deque
+import numpy as np
+
 
 class Node:
     def __init__(self, ID):
@@ -7,7 +20,7 @@ class Node:
         self.neighbors: list[Node] = []
 
     def __iter__(self):
-        return self.neighbors
+        return iter(self.neighbors)
 
     def add_neighbor(self, other):
         if type(other) != Node:
@@ -16,10 +29,16 @@ class Node:
         self.neighbors.append(other)
 
     def __eq__(self, other) -> bool:
+        if not isinstance(other, Node):
+            return NotImplemented
         if self.ID == other.ID:
             return True
         return False
 
+    # Defining __eq__ sets __hash__ to None, which made nodes unusable in a visited set
+    def __hash__(self):
+        return hash(self.ID)
+
     def get_neighbors(self):
         return self.neighbors
 
@@ -27,15 +46,200 @@ class Node:
         return f"ID_{self.ID}"
 
 
+class SlotNode:
+    __slots__ = ("ID", "neighbors")
 
+    def __init__(self, ID):
+        self.ID = ID
+        self.neighbors: list[SlotNode] = []
+
+    def __iter__(self):
+        return iter(self.neighbors)
+
+    def add_neighbor(self, other):
+        if type(other) != SlotNode:
+            raise ValueError("other must be another node!")
+        other.neighbors.append(self)
+        self.neighbors.append(other)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SlotNode):
+            return NotImplemented
+        return self.ID == other.ID
+
+    def __hash__(self):
+        return hash(self.ID)
+
+    def __repr__(self):
+        return f"ID_{self.ID}"
+
+
+# --- Graph generators, all returning (n, src, dst) with one entry per undirected edge ---
+
+def random_graph(n: int, avg_degree: float = 6, seed: int | None = None):
+    rng = np.random.default_rng(seed)
+    m = int(n * avg_degree / 2)
+    src, dst = rng.integers(0, n, m), rng.integers(0, n, m)
+    keep = src != dst
+    return n, src[keep], dst[keep]
 
-if __name__ == "__main__":
-    nodes: list[Node] = []
-    for i in range(100):
-        nodes.append(Node(i))
 
-    nums = []
+def grid_graph(side: int):
+    # side x side lattice, vertex i * side + j joined to its right and down neighbours
+    ids = np.arange(side * side).reshape(side, side)
+    src = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    dst = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    return side * side, src, dst
 
 
+def scale_free_graph(n: int, m: int = 3, seed: int | None = None):
+    '''
+    Barabasi-Albert style preferential attachment: every new vertex adds m edges, and
+    picking a uniformly random endpoint of an existing edge picks a vertex in proportion
+    to its degree. An endpoint that is itself a target not yet decided just points at an
+    earlier edge, so all the choices are drawn at once and resolved by pointer chasing.
+    '''
+    rng = np.random.default_rng(seed)
+    e = np.arange(m * (n - m))
+    src = m + e // m
+    dst = np.full(len(e), -1)
+    dst[:m] = np.arange(m)  # the first new vertex joins the m seed vertices
+    r = (rng.random(len(e)) * 2 * e).astype(np.int64)
+    copy_from = np.where(r % 2 == 1, r // 2, -1)  # odd: same target as edge r // 2
+    direct = (r % 2 == 0) & (e >= m)
+    dst[direct] = src[r[direct] // 2]
+    todo = np.flatnonzero(dst < 0)
+    while len(todo):
+        ready = dst[copy_from[todo]] >= 0
+        dst[todo[ready]] = dst[copy_from[todo[ready]]]
+        todo = todo[~ready]
+    keep = src != dst
+    return n, src[keep], dst[keep]
 
 
+# --- Building each representation ---
+
+def build_objects(n, src, dst, node_class=Node) -> list:
+    nodes = [node_class(i) for i in range(n)]
+    for u, v in zip(src.tolist(), dst.tolist()):
+        nodes[u].add_neighbor(nodes[v])
+    return nodes
+
+
+def build_adjacency(n, src, dst) -> list[list[int]]:
+    adj = [[] for _ in range(n)]
+    for u, v in zip(src.tolist(), dst.tolist()):
+        adj[u].append(v)
+        adj[v].append(u)
+    return adj
+
+
+def build_csr(n, src, dst) -> tuple[np.ndarray, np.ndarray]:
+    both_src = np.concatenate([src, dst])
+    both_dst = np.concatenate([dst, src])
+    order = np.argsort(both_src, kind="stable")
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(both_src, minlength=n), out=offsets[1:])
+    return offsets, both_dst[order]
+
+
+# --- Traversals. Each returns how many vertices it reached from the start ---
+
+def bfs_objects(start) -> int:
+    visited = {start}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for neigh in node.neighbors:
+            if neigh not in visited:
+                visited.add(neigh)
+                queue.append(neigh)
+    return len(visited)
+
+
+def dfs_objects(start) -> int:
+    visited = set()
+    stack = [start]
+    while stack:
+        node = stack.pop()
+        if node in visited:
+            continue
+        visited.add(node)
+        stack.extend(node.neighbors)
+    return len(visited)
+
+
+def bfs_adjacency(adj, start: int) -> int:
+    visited = bytearray(len(adj))
+    visited[start] = 1
+    queue = deque([start])
+    count = 1
+    while queue:
+        for v in adj[queue.popleft()]:
+            if not visited[v]:
+                visited[v] = 1
+                queue.append(v)
+                count += 1
+    return count
+
+
+def dfs_adjacency(adj, start: int) -> int:
+    visited = bytearray(len(adj))
+    stack = [start]
+    count = 0
+    while stack:
+        u = stack.pop()
+        if visited[u]:
+            continue
+        visited[u] = 1
+        count += 1
+        stack.extend(adj[u])
+    return count
+
+
+def bfs_csr(offsets, targets, start: int) -> int:
+    # Level by level: gather every edge out of the frontier at once
+    visited = np.zeros(len(offsets) - 1, dtype=bool)
+    visited[start] = True
+    frontier = np.array([start])
+    count = 1
+    while len(frontier):
+        lo, hi = offsets[frontier], offsets[frontier + 1]
+        lengths = hi - lo
+        # index of every edge out of the frontier, without a Python loop
+        edge = np.repeat(lo - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        nxt = targets[edge]
+        nxt = np.unique(nxt[~visited[nxt]])
+        visited[nxt] = True
+        count += len(nxt)
+        frontier = nxt
+    return count
+
+
+def dfs_csr(offsets, targets, start: int) -> int:
+    # DFS can't be done a level at a time, so this walks the arrays from Python
+    # (through memoryviews, which index much faster than NumPy arrays do)
+    off, tgt = memoryview(offsets), memoryview(targets)
+    visited = bytearray(len(offsets) - 1)
+    stack = [start]
+    count = 0
+    while stack:
+        u = stack.pop()
+        if visited[u]:
+            continue
+        visited[u] = 1
+        count += 1
+        stack.extend(tgt[off[u]:off[u + 1]].tolist())
+    return count
+
+
+if __name__ == "__main__":
+    nodes: list[Node] = []
+    for i in range(100):
+        nodes.append(Node(i))
+
+    # Join each node to one random other and see how much of the graph BFS reaches
+    rng = random.Random(0)
+    for node in nodes:
+        node.add_neighbor(rng.choice(nodes))
+    print(f"BFS from {nodes[0]} reached {bfs_objects(nodes[0])} of {len(nodes)} nodes")
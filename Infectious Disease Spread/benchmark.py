@@ -0,0 +1,105 @@
+import random
+import time
+import matplotlib.pyplot as plt
+from main import spawn_agents, spread_infections, maybe_infect, INFECTION_RADIUS
+from spatial_hash import SpatialHash
+from numpy_engine import AgentArrays
+
+# Headless comparison of the old all-pairs infection check vs the spatial hash,
+# plus the AgentArrays (NumPy) backend using the same grid idea.
+# "pair tests" = number of (infected, candidate) distance checks done in a tick.
+
+AGENT_COUNTS = [100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000]
+TICKS = 30
+BRUTE_FORCE_LIMIT = 2000  # all-pairs gets painfully slow past this, so only time it up to here
+SEED = 42
+
+
+def brute_force_tick(agents) -> int:
+    for i in range(len(agents)):
+        ai = agents[i]
+        for j in range(i + 1, len(agents)):
+            maybe_infect(ai, agents[j])
+    return len(agents) * (len(agents) - 1) // 2
+
+
+def run(n: int, use_grid: bool) -> tuple[float, float]:
+    '''
+    Returns (avg pair tests per tick, avg ms per tick) over TICKS ticks.
+    '''
+    random.seed(SEED)
+    agents = spawn_agents(n)
+    grid = SpatialHash(INFECTION_RADIUS)
+    tests = 0
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        for a in agents:
+            a.move()
+        if use_grid:
+            grid.reset_stats()
+            spread_infections(agents, grid)
+            tests += grid.pair_tests
+        else:
+            tests += brute_force_tick(agents)
+        for a in agents:
+            a.step_disease()
+    elapsed = time.perf_counter() - start
+    return tests / TICKS, elapsed * 1000 / TICKS
+
+
+def run_arrays(n: int) -> tuple[float, float]:
+    pop = AgentArrays(n, seed=SEED)
+    tests = 0
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        pop.step()
+        tests += pop.pair_tests
+    elapsed = time.perf_counter() - start
+    return tests / TICKS, elapsed * 1000 / TICKS
+
+
+if __name__ == "__main__":
+    grid_tests: list[float] = []
+    grid_ms: list[float] = []
+    numpy_ms: list[float] = []
+    brute_counts: list[int] = []
+    brute_ms: list[float] = []
+
+    print(f"{'N_AGENTS':>9} {'grid tests/tick':>16} {'grid ms/tick':>13} {'numpy ms/tick':>14} {'all-pairs tests/tick':>21} {'all-pairs ms/tick':>18}")
+    for n in AGENT_COUNTS:
+        t, ms = run(n, use_grid=True)
+        grid_tests.append(t)
+        grid_ms.append(ms)
+        _, nms = run_arrays(n)
+        numpy_ms.append(nms)
+
+        bt_str, bms_str = f"{n * (n - 1) // 2:,}", "-"
+        if n <= BRUTE_FORCE_LIMIT:
+            _, bms = run(n, use_grid=False)
+            brute_counts.append(n)
+            brute_ms.append(bms)
+            bms_str = f"{bms:.1f}"
+
+        print(f"{n:>9} {t:>16,.0f} {ms:>13.1f} {nms:>14.1f} {bt_str:>21} {bms_str:>18}")
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6)) # type: ignore
+    ax1.plot(AGENT_COUNTS, grid_tests, marker='o', label="Spatial hash") # type: ignore
+    ax1.plot(AGENT_COUNTS, [n * (n - 1) / 2 for n in AGENT_COUNTS], marker='s', label="All pairs") # type: ignore
+    ax1.set_xscale('log') # type: ignore
+    ax1.set_yscale('log') # type: ignore
+    ax1.set_xlabel("N_AGENTS") # type: ignore
+    ax1.set_ylabel("Pair tests per tick") # type: ignore
+    ax1.legend() # type: ignore
+
+    ax2.plot(AGENT_COUNTS, grid_ms, marker='o', label="Spatial hash") # type: ignore
+    ax2.plot(AGENT_COUNTS, numpy_ms, marker='^', label="AgentArrays (NumPy)") # type: ignore
+    ax2.plot(brute_counts, brute_ms, marker='s', label="All pairs") # type: ignore
+    ax2.axhline(1000 / 60, linestyle='--', color='grey', label="60 FPS budget") # type: ignore
+    ax2.set_xscale('log') # type: ignore
+    ax2.set_yscale('log') # type: ignore
+    ax2.set_xlabel("N_AGENTS") # type: ignore
+    ax2.set_ylabel("ms per tick") # type: ignore
+    ax2.legend() # type: ignore
+
+    plt.tight_layout()
+    plt.show() # type: ignore
@@ -1,3 +1,19 @@
 class Constants:
     X_WIDTH: int = 1000
     Y_WIDTH: int = 1000
+
+
+# ---------- Tunable parameters ----------
+WIDTH, HEIGHT = 1000, 1000
+N_AGENTS = 200
+INIT_INFECTED = 3
+AGENT_SIZE = 6                     # radius for drawing & collision
+SPEED_MIN, SPEED_MAX = 1.5, 2.8    # pixels per frame
+INFECTION_RADIUS = 2 * AGENT_SIZE  # proximity for infection
+INFECTION_PROB = 0.05            # chance to infect on close contact per tick
+RECOVERY_TIME = 8 * 60             # frames until outcome (~8s at 60 FPS)
+MORTALITY_PROB = 1              # chance an infected dies instead of recovers
+FPS = 60
+
+# ---------- State ----------
+HEALTHY, INFECTED, RECOVERED, DEAD = range(4)
@@ -0,0 +1,55 @@
+import random
+import numpy as np
+import matplotlib.pyplot as plt
+from main import spawn_agents, step_agents, count_states
+from numpy_engine import AgentArrays
+from spatial_hash import SpatialHash
+from constants import INFECTION_RADIUS
+
+# Runs the Sprite model and the AgentArrays model side by side and compares their
+# average epidemic curves. Single runs are too noisy (and use different random
+# streams), so we average over a bunch of replicates of each.
+
+N = 500
+TICKS = 1500
+REPLICATES = 20
+LABELS = ["Healthy", "Infected", "Recovered", "Dead"]
+
+
+def object_curves(seed: int) -> np.ndarray:
+    random.seed(seed)
+    agents = spawn_agents(N)
+    grid = SpatialHash(INFECTION_RADIUS)
+    out = np.empty((TICKS, 4))
+    for t in range(TICKS):
+        step_agents(agents, grid)
+        out[t] = count_states(agents)
+    return out
+
+
+def array_curves(seed: int) -> np.ndarray:
+    pop = AgentArrays(N, seed=seed)
+    out = np.empty((TICKS, 4))
+    for t in range(TICKS):
+        pop.step()
+        out[t] = pop.count_states()
+    return out
+
+
+if __name__ == "__main__":
+    objs = np.mean([object_curves(s) for s in range(REPLICATES)], axis=0)
+    arrs = np.mean([array_curves(s) for s in range(REPLICATES)], axis=0)
+
+    for k, label in enumerate(LABELS):
+        gap = np.abs(objs[:, k] - arrs[:, k]).max() / N * 100
+        print(f"{label:>9}: max gap between mean curves = {gap:.1f}% of N")
+
+    colors = ['#2ca02c', '#d62728', '#1f77b4', '#7f7f7f']
+    for k, label in enumerate(LABELS):
+        plt.plot(objs[:, k], color=colors[k], label=f"{label} (Sprite)") # type: ignore
+        plt.plot(arrs[:, k], color=colors[k], linestyle='--', label=f"{label} (AgentArrays)") # type: ignore
+    plt.xlabel("Tick") # type: ignore
+    plt.ylabel(f"Mean agents over {REPLICATES} runs") # type: ignore
+    plt.title("Sprite vs AgentArrays epidemic curves") # type: ignore
+    plt.legend() # type: ignore
+    plt.show() # type: ignore
@@ -0,0 +1,44 @@
+import numpy as np
+from numpy_engine import AgentArrays
+from constants import N_AGENTS, INFECTION_PROB, RECOVERY_TIME, MORTALITY_PROB, INFECTED, FPS
+
+# No window, no FPS cap: just step the AgentArrays model as fast as possible and
+# record how many agents are in each state after every tick.
+
+
+def simulate(n: int = N_AGENTS, ticks: int = 60 * FPS, seed: int | None = None,
+             infection_prob: float = INFECTION_PROB,
+             recovery_time: int = RECOVERY_TIME,
+             mortality_prob: float = MORTALITY_PROB) -> np.ndarray:
+    '''
+    Returns a (ticks, 4) int array of S/I/R/D counts (healthy, infected, recovered, dead),
+    one row per tick. Once nobody is infected the counts can't change any more, so the
+    run stops there and the last row is repeated for the remaining ticks.
+    '''
+    pop = AgentArrays(n, seed=seed, infection_prob=infection_prob,
+                      recovery_time=recovery_time, mortality_prob=mortality_prob)
+    out = np.empty((ticks, 4), dtype=np.int32)
+    for t in range(ticks):
+        pop.step()
+        out[t] = pop.count_states()
+        if out[t, INFECTED] == 0:
+            out[t + 1:] = out[t]
+            break
+    return out
+
+
+if __name__ == "__main__":
+    import time
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    curves = simulate(seed=0)
+    print(f"Simulated {len(curves)} ticks ({len(curves) // FPS}s of sim time) in {time.perf_counter() - start:.2f}s")
+    print(f"Final H/I/R/D: {curves[-1].tolist()}")
+
+    for k, label in enumerate(["Healthy", "Infected", "Recovered", "Dead"]):
+        plt.plot(np.arange(len(curves)) / FPS, curves[:, k], label=label) # type: ignore
+    plt.xlabel("Sim time (s)") # type: ignore
+    plt.ylabel("Agents") # type: ignore
+    plt.legend() # type: ignore
+    plt.show() # type: ignore
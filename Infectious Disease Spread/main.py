@@ -2,18 +2,13 @@ import pygame
 import random
 import math
 from dataclasses import dataclass
+from spatial_hash import SpatialHash
+from numpy_engine import AgentArrays
+from constants import (WIDTH, HEIGHT, N_AGENTS, INIT_INFECTED, AGENT_SIZE, SPEED_MIN, SPEED_MAX,
+                       INFECTION_RADIUS, INFECTION_PROB, RECOVERY_TIME, MORTALITY_PROB, FPS,
+                       HEALTHY, INFECTED, RECOVERED, DEAD)
 
-# ---------- Tunable parameters ----------
-WIDTH, HEIGHT = 1000, 1000
-N_AGENTS = 200
-INIT_INFECTED = 3
-AGENT_SIZE = 6                     # radius for drawing & collision
-SPEED_MIN, SPEED_MAX = 1.5, 2.8    # pixels per frame
-INFECTION_RADIUS = 2 * AGENT_SIZE  # proximity for infection
-INFECTION_PROB = 0.05            # chance to infect on close contact per tick
-RECOVERY_TIME = 8 * 60             # frames until outcome (~8s at 60 FPS)
-MORTALITY_PROB = 1              # chance an infected dies instead of recovers
-FPS = 60
+BACKEND = "objects"  # "objects" = one Sprite per agent, "numpy" = AgentArrays (much faster for big N)
 
 # Colors
 HEALTHY_COLOR = (40, 200, 120)
@@ -23,9 +18,6 @@ DEAD_COLOR = (220, 220, 220)
 BG = (10, 10, 10)
 HUD = (220, 60, 60)
 
-# ---------- State ----------
-HEALTHY, INFECTED, RECOVERED, DEAD = range(4)
-
 @dataclass
 class Sprite:
     x: float
@@ -115,6 +107,29 @@ def maybe_infect(a: Sprite, b: Sprite):
     if b.state == INFECTED and a.state == HEALTHY and random.random() < INFECTION_PROB:
         a.infect()
 
+def spread_infections(agents, grid: SpatialHash):
+    # Only healthy agents can catch anything, so only they go in the grid, and
+    # only infected agents need to look around. Cell size >= INFECTION_RADIUS
+    # means the 3x3 block around an infected agent covers everyone it can reach.
+    # Infected list is taken up front so someone infected this tick can't pass it on
+    # until the next one (AgentArrays.spread works the same way).
+    grid.rebuild(a for a in agents if a.state == HEALTHY)
+    for a in [a for a in agents if a.state == INFECTED]:
+        for b in grid.query(a.x, a.y):
+            maybe_infect(a, b)
+
+def step_agents(agents, grid: SpatialHash):
+    # Movement
+    for a in agents:
+        a.move()
+
+    # Infections (grid-partitioned, only checks agents in neighbouring cells)
+    spread_infections(agents, grid)
+
+    # Disease progression
+    for a in agents:
+        a.step_disease()
+
 def spawn_agents(n):
     agents = []
     for _ in range(n):
@@ -135,8 +150,23 @@ def count_states(agents):
     d = sum(1 for a in agents if a.state == DEAD)
     return h, i, r, d
 
-def draw_hud(screen, font, frame, agents):
-    h, i, r, d = count_states(agents)
+def draw_arrays(surface, pop: AgentArrays):
+    # Draw straight from the NumPy arrays, one colour group at a time
+    for state, color in ((HEALTHY, HEALTHY_COLOR), (INFECTED, INFECTED_COLOR),
+                         (RECOVERED, RECOVERED_COLOR), (DEAD, DEAD_COLOR)):
+        mask = pop.state == state
+        xs = pop.x[mask].astype(int).tolist()
+        ys = pop.y[mask].astype(int).tolist()
+        for x, y in zip(xs, ys):
+            pygame.draw.circle(surface, color, (x, y), pop.r)
+
+def new_population():
+    if BACKEND == "numpy":
+        return AgentArrays(N_AGENTS)
+    return spawn_agents(N_AGENTS)
+
+def draw_hud(screen, font, frame, counts):
+    h, i, r, d = counts
     text = f"n: {h+i+r+d} H:{h} I:{i} R:{r} D:{d} IP: {100-round(100*(h+d+r)/(h+i+r+d),1)} SP: {round(100*(h+i+r)/(h+i+r+d),1)}    t={frame//FPS}s"
     surf = font.render(text, True, HUD)
     screen.blit(surf, (10, 10)) # 200 in 400m2
@@ -148,7 +178,8 @@ def main():
     clock = pygame.time.Clock()
     font = pygame.font.SysFont("Menlo", 18)
 
-    agents = spawn_agents(N_AGENTS)
+    agents = new_population()
+    grid = SpatialHash(INFECTION_RADIUS)
 
     running = True
     paused = False
@@ -164,33 +195,26 @@ def main():
                 elif event.key == pygame.K_SPACE:
                     paused = not paused
                 elif event.key == pygame.K_r:
-                    agents = spawn_agents(N_AGENTS)
+                    agents = new_population()
                     frame = 0
                     paused = False
 
         if not paused:
-            # Movement
-            for a in agents:
-                a.move()
-
-            # Infections (O(n^2) – fine for ~ few hundred agents; you can grid-partition later)
-            for i in range(len(agents)):
-                ai = agents[i]
-                for j in range(i + 1, len(agents)):
-                    aj = agents[j]
-                    maybe_infect(ai, aj)
-
-            # Disease progression
-            for a in agents:
-                a.step_disease()
-
+            if BACKEND == "numpy":
+                agents.step()
+            else:
+                step_agents(agents, grid)
             frame += 1
 
         # Draw
         screen.fill(BG)
-        for a in agents:
-            a.draw(screen)
-        draw_hud(screen, font, frame, agents)
+        if BACKEND == "numpy":
+            draw_arrays(screen, agents)
+            draw_hud(screen, font, frame, agents.count_states())
+        else:
+            for a in agents:
+                a.draw(screen)
+            draw_hud(screen, font, frame, count_states(agents))
 
         # Pause banner
         if paused:
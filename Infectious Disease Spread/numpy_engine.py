@@ -0,0 +1,146 @@
+import numpy as np
+from constants import (WIDTH, HEIGHT, INIT_INFECTED, AGENT_SIZE, SPEED_MIN, SPEED_MAX,
+                       INFECTION_RADIUS, INFECTION_PROB, RECOVERY_TIME, MORTALITY_PROB,
+                       HEALTHY, INFECTED, RECOVERED, DEAD)
+
+# Offsets of the 3x3 block of cells around a cell, for a grid `cols` cells wide
+def _neighbour_offsets(cols: int) -> np.ndarray:
+    return np.array([dy * cols + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1)], dtype=np.int64)
+
+
+class AgentArrays:
+    '''
+    Structure-of-arrays version of the Sprite model. Instead of one object per agent,
+    every attribute lives in its own NumPy array (x[i], y[i], ... is agent i), so each
+    part of a tick (movement, wall bounces, infection, timers, outcome rolls, counting)
+    is a handful of whole-array operations rather than a Python loop over agents.
+
+    The rules are the same as Sprite / maybe_infect / step_disease in main.py, so the
+    two backends should give the same epidemic curves (statistically - they use
+    different random streams, so individual runs won't match exactly).
+    '''
+    def __init__(self, n: int, seed: int | None = None,
+                 infection_prob: float = INFECTION_PROB,
+                 recovery_time: int = RECOVERY_TIME,
+                 mortality_prob: float = MORTALITY_PROB,
+                 init_infected: int = INIT_INFECTED,
+                 width: int = WIDTH, height: int = HEIGHT):
+        self.rng = np.random.default_rng(seed)
+        self.n = n
+        self.width = width
+        self.height = height
+        self.r = AGENT_SIZE  # Sprite.r is width // 2 and width is AGENT_SIZE * 2
+        self.infection_prob = infection_prob
+        self.recovery_time = recovery_time
+        self.mortality_prob = mortality_prob
+        self.pair_tests = 0
+
+        # Same spawn rules as spawn_agents / Sprite.__post_init__
+        self.x = self.rng.uniform(AGENT_SIZE + 5, width - AGENT_SIZE - 5, n)
+        self.y = self.rng.uniform(AGENT_SIZE + 5, height - AGENT_SIZE - 5, n)
+        speed = self.rng.uniform(SPEED_MIN, SPEED_MAX, n)
+        angle = self.rng.uniform(0, 2 * np.pi, n)
+        self.vx = np.cos(angle) * speed
+        self.vy = np.sin(angle) * speed
+        self.state = np.full(n, HEALTHY, dtype=np.int8)
+        self.infection_timer = np.zeros(n, dtype=np.int32)
+
+        seeds = self.rng.choice(n, size=min(init_infected, n), replace=False)
+        self.state[seeds] = INFECTED
+
+        # Grid for the infection check, padded by one cell on each side so the
+        # -1/+1 neighbour offsets never wrap around to the other edge
+        self.cell_size = INFECTION_RADIUS
+        self.cols = int(width // self.cell_size) + 3
+        self.offsets = _neighbour_offsets(self.cols)
+
+    def step(self) -> None:
+        # Same order as the main loop: move, infect, then progress the disease
+        self.move()
+        self.spread()
+        self.step_disease()
+
+    def move(self) -> None:
+        # Dead agents have vx = vy = 0 and are already inside the walls,
+        # so they can go through the same update without a mask
+        x, y, vx, vy, r = self.x, self.y, self.vx, self.vy, self.r
+        x += vx
+        y += vy
+
+        hit = x - r < 0
+        x[hit] = r
+        vx[hit] = -vx[hit]
+        hit = x + r > self.width
+        x[hit] = self.width - r
+        vx[hit] = -vx[hit]
+
+        hit = y - r < 0
+        y[hit] = r
+        vy[hit] = -vy[hit]
+        hit = y + r > self.height
+        y[hit] = self.height - r
+        vy[hit] = -vy[hit]
+
+    def _cells(self, idx: np.ndarray) -> np.ndarray:
+        cx = (self.x[idx] // self.cell_size).astype(np.int64) + 1
+        cy = (self.y[idx] // self.cell_size).astype(np.int64) + 1
+        return cy * self.cols + cx
+
+    def spread(self) -> None:
+        '''
+        Vectorised version of the spatial hash: sort healthy agents by cell, then for every
+        infected agent look up the range of healthy agents in each of its 9 neighbouring
+        cells with searchsorted. Every (infected, healthy) pair within INFECTION_RADIUS
+        gets its own infection roll, exactly like maybe_infect.
+        '''
+        healthy = np.flatnonzero(self.state == HEALTHY)
+        infected = np.flatnonzero(self.state == INFECTED)
+        self.pair_tests = 0
+        if len(healthy) == 0 or len(infected) == 0:
+            return
+
+        hcells = self._cells(healthy)
+        order = np.argsort(hcells, kind="stable")
+        hcells = hcells[order]
+        healthy = healthy[order]
+
+        targets = (self._cells(infected)[:, None] + self.offsets[None, :]).ravel()
+        lo = np.searchsorted(hcells, targets, side="left")
+        hi = np.searchsorted(hcells, targets, side="right")
+        counts = hi - lo
+        total = int(counts.sum())
+        self.pair_tests = total
+        if total == 0:
+            return
+
+        # Expand each (infected, cell) range into one row per candidate pair
+        src = np.repeat(np.repeat(infected, len(self.offsets)), counts)
+        group_start = np.repeat(np.cumsum(counts) - counts, counts)
+        dst = healthy[np.repeat(lo, counts) + (np.arange(total) - group_start)]
+
+        dx = self.x[src] - self.x[dst]
+        dy = self.y[src] - self.y[dst]
+        close = dst[dx * dx + dy * dy <= INFECTION_RADIUS * INFECTION_RADIUS]
+        caught = close[self.rng.random(len(close)) < self.infection_prob]
+        if len(caught):
+            caught = np.unique(caught)
+            self.state[caught] = INFECTED
+            self.infection_timer[caught] = 0
+
+    def step_disease(self) -> None:
+        infected = np.flatnonzero(self.state == INFECTED)
+        self.infection_timer[infected] += 1
+        done = infected[self.infection_timer[infected] >= self.recovery_time]
+        if len(done) == 0:
+            return
+        # Outcome roll
+        dies = self.rng.random(len(done)) < self.mortality_prob
+        dead = done[dies]
+        self.state[dead] = DEAD
+        self.vx[dead] = 0
+        self.vy[dead] = 0
+        self.state[done[~dies]] = RECOVERED
+
+    def count_states(self) -> tuple[int, int, int, int]:
+        h, i, r, d = np.bincount(self.state, minlength=4)[:4].tolist()
+        return h, i, r, d
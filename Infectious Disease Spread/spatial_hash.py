@@ -0,0 +1,49 @@
+from collections import defaultdict
+
+
+class SpatialHash:
+    '''
+    Uniform grid that buckets agents into square cells of side `cell_size`.
+    If cell_size >= the interaction radius, anything within that radius of a
+    point is guaranteed to be in the point's cell or one of its 8 neighbours,
+    so a query only has to look at a 3x3 block of cells instead of every agent.
+    '''
+    def __init__(self, cell_size: float):
+        self.cell_size: float = cell_size
+        self.cells: defaultdict[tuple[int, int], list] = defaultdict(list)
+        self.pair_tests: int = 0  # how many candidates have been handed out since last reset
+
+    def cell_of(self, x: float, y: float) -> tuple[int, int]:
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def clear(self) -> None:
+        self.cells.clear()
+
+    def insert(self, agent) -> None:
+        self.cells[self.cell_of(agent.x, agent.y)].append(agent)
+
+    def rebuild(self, agents) -> None:
+        # Agents move every tick, so it's cheaper to just re-bucket everyone
+        # than to track who crossed a cell boundary
+        self.cells.clear()
+        cell_size = self.cell_size
+        cells = self.cells
+        for a in agents:
+            cells[(int(a.x // cell_size), int(a.y // cell_size))].append(a)
+
+    def query(self, x: float, y: float):
+        '''
+        Yields every agent in the 3x3 block of cells around (x, y). These are only
+        candidates - the caller still has to do the actual distance check.
+        '''
+        cx, cy = self.cell_of(x, y)
+        cells = self.cells
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                bucket = cells.get((gx, gy))
+                if bucket:
+                    self.pair_tests += len(bucket)
+                    yield from bucket
+
+    def reset_stats(self) -> None:
+        self.pair_tests = 0
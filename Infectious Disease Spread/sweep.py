@@ -0,0 +1,78 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from headless import simulate
+from constants import N_AGENTS, FPS
+
+# Parameter sweep over the epidemic model. Every (parameter set, seed) pair is an
+# independent headless run, so they're spread across a process pool and the S/I/R/D
+# curves are streamed into a single Parquet file (long format, one row per tick).
+
+INFECTION_PROBS = [0.01, 0.02, 0.05, 0.1]
+RECOVERY_TIMES = [4 * FPS, 8 * FPS, 16 * FPS]
+MORTALITY_PROBS = [0.01, 0.1, 0.5, 1.0]
+REPLICATES = 20      # seeds 0..REPLICATES-1, same seeds reused for every parameter set
+N = N_AGENTS
+TICKS = 60 * FPS
+OUTPUT = "sweep_results.parquet"
+WRITE_EVERY = 64     # runs buffered in memory before being flushed as a row group
+
+SCHEMA = pa.schema([
+    ("run_id", pa.int32()),
+    ("infection_prob", pa.float64()),
+    ("recovery_time", pa.int32()),
+    ("mortality_prob", pa.float64()),
+    ("seed", pa.int32()),
+    ("tick", pa.int32()),
+    ("healthy", pa.int32()),
+    ("infected", pa.int32()),
+    ("recovered", pa.int32()),
+    ("dead", pa.int32()),
+])
+
+
+def run_one(job: tuple[int, float, int, float, int]) -> tuple[tuple[int, float, int, float, int], np.ndarray]:
+    run_id, infection_prob, recovery_time, mortality_prob, seed = job
+    curves = simulate(n=N, ticks=TICKS, seed=seed, infection_prob=infection_prob,
+                      recovery_time=recovery_time, mortality_prob=mortality_prob)
+    return job, curves
+
+
+def to_table(results: list[tuple[tuple[int, float, int, float, int], np.ndarray]]) -> pa.Table:
+    ticks = np.arange(TICKS, dtype=np.int32)
+    cols: dict[str, list[np.ndarray]] = {name: [] for name in SCHEMA.names}
+    for (run_id, infection_prob, recovery_time, mortality_prob, seed), curves in results:
+        cols["run_id"].append(np.full(TICKS, run_id, dtype=np.int32))
+        cols["infection_prob"].append(np.full(TICKS, infection_prob))
+        cols["recovery_time"].append(np.full(TICKS, recovery_time, dtype=np.int32))
+        cols["mortality_prob"].append(np.full(TICKS, mortality_prob))
+        cols["seed"].append(np.full(TICKS, seed, dtype=np.int32))
+        cols["tick"].append(ticks)
+        for k, name in enumerate(["healthy", "infected", "recovered", "dead"]):
+            cols[name].append(curves[:, k])
+    return pa.table({name: np.concatenate(parts) for name, parts in cols.items()}, schema=SCHEMA)
+
+
+if __name__ == "__main__":
+    grid = itertools.product(INFECTION_PROBS, RECOVERY_TIMES, MORTALITY_PROBS, range(REPLICATES))
+    jobs = [(run_id, *params) for run_id, params in enumerate(grid)]
+    print(f"{len(jobs)} runs of {TICKS} ticks on {os.cpu_count()} cores -> {OUTPUT}")
+
+    start = time.perf_counter()
+    buffer = []
+    with ProcessPoolExecutor() as pool, pq.ParquetWriter(OUTPUT, SCHEMA) as writer:
+        # imap-style: results come back in job order, chunksize keeps IPC overhead down
+        for done, result in enumerate(pool.map(run_one, jobs, chunksize=8), start=1):
+            buffer.append(result)
+            if len(buffer) >= WRITE_EVERY:
+                writer.write_table(to_table(buffer))
+                buffer.clear()
+                print(f"{done}/{len(jobs)} runs  ({time.perf_counter() - start:.0f}s)")
+        if buffer:
+            writer.write_table(to_table(buffer))
+
+    print(f"Done in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,242 @@
+'''
+External mergesort, for files of numbers too big to fit in memory.
+
+  1. Runs: read as many numbers as fit in the memory budget, sort them, and spill them
+     to a temp file as raw binary. Repeat until the input is used up.
+  2. Merge: the same idea as merge() in main.py (keep taking the smaller head), but
+     over k runs at once with a heap, and a block at a time instead of one number at a
+     time. Every run has a buffer of its next numbers. The heap is keyed on the last
+     number in each buffer, so its top is the smallest of those. Nothing left unread
+     in any run can be smaller than that, so every buffered number <= it is safe to
+     write out. Sorting those together finishes at least one buffer, which is then
+     refilled.
+  3. With more runs than the merge fan-in, groups of fan_in runs are merged into longer
+     runs first, and this repeats until one final merge writes the output.
+
+Memory use stays around memory_bytes however big the input is. To sort a 20 GB file on
+an 8 GB machine, call external_sort(src, dst, memory_bytes=4 * 2**30). That makes runs of
+256M doubles, so even a couple of billion numbers is about ten runs and one merge pass.
+'''
+
+import heapq
+import os
+import tempfile
+import time
+import numpy as np
+
+MEMORY_BUDGET = 256 * 2**20   # bytes
+FAN_IN = 64                   # runs merged at once
+PARSE_BYTES = 4 * 2**20       # text is read and parsed this much at a time...
+TEXT_WRITE_ITEMS = 1 << 17    # ...and formatted this many numbers at a time
+
+
+def read_numbers(path: str, dtype, binary: bool, chunk_items: int):
+    '''Yields the numbers in path as arrays of at most chunk_items.'''
+    if binary:
+        with open(path, "rb") as f:
+            while True:
+                block = np.fromfile(f, dtype=dtype, count=chunk_items)
+                if not len(block):
+                    return
+                yield block
+        return
+
+    parse = float if np.dtype(dtype).kind == "f" else int
+    with open(path, "rb") as f:
+        leftover = b""
+        while True:
+            data = f.read(min(PARSE_BYTES, chunk_items * 4))
+            if not data:
+                break
+            data = leftover + data
+            # a number may be cut in half at the end of the block: keep it for next time
+            cut = max(data.rfind(b"\n"), data.rfind(b" "))
+            if cut < 0:
+                leftover = data
+                continue
+            leftover = data[cut:]
+            yield np.fromiter(map(parse, data[:cut].split()), dtype=dtype)
+        if leftover.strip():
+            yield np.fromiter(map(parse, leftover.split()), dtype=dtype)
+
+
+class OutputFile:
+    def __init__(self, path: str, binary: bool):
+        self.f = open(path, "wb")
+        self.binary = binary
+        self.count = 0
+
+    def write(self, block: np.ndarray):
+        if self.binary:
+            block.tofile(self.f)
+        else:
+            # as Python floats/ints and then strings a number takes ~10x the memory, so a
+            # big block is formatted a slice at a time
+            for i in range(0, len(block), TEXT_WRITE_ITEMS):
+                self.f.write(("\n".join(map(str, block[i:i + TEXT_WRITE_ITEMS].tolist())) + "\n").encode())
+        self.count += len(block)
+
+    def close(self):
+        self.f.close()
+
+
+def make_runs(path: str, tmp_dir: str, run_items: int, dtype, binary: bool) -> list[str]:
+    # Fill one run-sized array at a time, sort it in place, spill it as raw binary
+    runs = []
+    run = np.empty(run_items, dtype=dtype)
+    filled = 0
+
+    def spill():
+        nonlocal filled
+        run[:filled].sort()
+        run_path = os.path.join(tmp_dir, f"run{len(runs)}.bin")
+        run[:filled].tofile(run_path)
+        runs.append(run_path)
+        filled = 0
+
+    for block in read_numbers(path, dtype, binary, run_items):
+        while len(block):
+            take = min(len(block), run_items - filled)
+            run[filled:filled + take] = block[:take]
+            filled += take
+            block = block[take:]
+            if filled == run_items:
+                spill()
+    if filled:
+        spill()
+    return runs
+
+
+def merge_runs(run_paths: list[str], out: OutputFile, memory_bytes: int, dtype):
+    '''k-way merge of sorted binary run files into out, within about memory_bytes.'''
+    if not run_paths:
+        return
+    # a quarter of the budget for the run buffers; the block being written out, its
+    # sorted copy and the sort's scratch space can each be as big again
+    buffer_items = max(memory_bytes // (4 * len(run_paths) * np.dtype(dtype).itemsize), 1)
+    files = [open(p, "rb") for p in run_paths]
+    buffers: list[np.ndarray] = [np.empty(0, dtype=dtype)] * len(files)
+    heap = []  # (is it NaN, last buffered number, run)
+
+    def refill(run: int):
+        buffers[run] = np.fromfile(files[run], dtype=dtype, count=buffer_items)
+        if len(buffers[run]):
+            # NaN compares false with everything, so it's keyed to sort last, which is
+            # where np.sort and np.searchsorted put it too
+            tail = buffers[run][-1]
+            heapq.heappush(heap, (bool(tail != tail), tail, run))
+
+    try:
+        for run in range(len(files)):
+            refill(run)
+        while heap:
+            bound = heap[0][1]
+            parts = []
+            for _, _, run in heap:
+                cut = np.searchsorted(buffers[run], bound, side="right")
+                if cut:
+                    parts.append(buffers[run][:cut])
+                    buffers[run] = buffers[run][cut:]
+            # each part is already sorted, which the stable sort (a merge sort) makes use of
+            out.write(np.sort(np.concatenate(parts), kind="stable"))
+            # The buffers that ended at the bound are now empty. They're all taken out
+            # before any is refilled, since a refilled buffer can start with the bound again
+            empty = [run for _, _, run in heap if not len(buffers[run])]
+            heap[:] = [entry for entry in heap if len(buffers[entry[2]])]
+            heapq.heapify(heap)
+            for run in empty:
+                refill(run)
+    finally:
+        for f in files:
+            f.close()
+
+
+def external_sort(in_path: str, out_path: str, memory_bytes: int = MEMORY_BUDGET, fan_in: int = FAN_IN,
+                  run_items: int | None = None, dtype=np.float64, binary: bool = False,
+                  tmp_dir: str | None = None) -> int:
+    '''
+    Sorts the numbers in in_path into out_path and returns how many there were. Text
+    files are whitespace/newline separated numbers and are written back one per line;
+    with binary=True both files are raw arrays of dtype. run_items overrides the run
+    length worked out from memory_bytes (half the budget per run, the rest is parsing
+    overhead). Temp files go in tmp_dir (default: the system temp dir), which needs
+    room for a copy of the data in binary.
+    '''
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    run_items = run_items or max(memory_bytes // (2 * np.dtype(dtype).itemsize), 1)
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as work:
+        runs = make_runs(in_path, work, run_items, dtype, binary)
+        if not runs:
+            # an empty input still gets an (empty) output file
+            OutputFile(out_path, binary).close()
+            return 0
+        generation = 0
+        while len(runs) > fan_in:
+            generation += 1
+            merged = []
+            for g in range(0, len(runs), fan_in):
+                group = runs[g:g + fan_in]
+                merged_path = os.path.join(work, f"merge{generation}_{len(merged)}.bin")
+                out = OutputFile(merged_path, binary=True)
+                merge_runs(group, out, memory_bytes, dtype)
+                out.close()
+                for p in group:
+                    os.remove(p)
+                merged.append(merged_path)
+            runs = merged
+
+        out = OutputFile(out_path, binary)
+        try:
+            merge_runs(runs, out, memory_bytes, dtype)
+        finally:
+            out.close()
+    return out.count
+
+
+if __name__ == "__main__":
+    import resource
+    from main import mergesort
+
+    # A small check against the in-memory mergesort, with runs of 100 and fan-in 3 so
+    # there are several merge passes
+    rng = np.random.default_rng(0)
+    small = rng.integers(-1000, 1000, 5_000)
+    with tempfile.TemporaryDirectory() as d:
+        src, dst = os.path.join(d, "in.txt"), os.path.join(d, "out.txt")
+        np.savetxt(src, small, fmt="%d")
+        external_sort(src, dst, run_items=100, fan_in=3, dtype=np.int64)
+        assert np.loadtxt(dst, dtype=np.int64).tolist() == mergesort(small.tolist())
+
+        # An empty file, and NaNs (which "float" parses happily), which end up last
+        open(src, "w").close()
+        assert external_sort(src, dst) == 0 and os.path.getsize(dst) == 0
+        with open(src, "w") as f:
+            f.write("3 nan 1\n")
+        assert external_sort(src, dst) == 3
+        assert open(dst).read().split() == ["1.0", "3.0", "nan"]
+        with_nan = np.where(rng.random(5_000) < 0.1, np.nan, rng.integers(-1000, 1000, 5_000))
+        np.savetxt(src, with_nan)
+        external_sort(src, dst, run_items=100, fan_in=3)
+        assert np.array_equal(np.loadtxt(dst), np.sort(with_nan), equal_nan=True)
+
+    # A bigger text file sorted with a 64 MB budget
+    N = 50_000_000
+    BUDGET = 64 * 2**20
+    with tempfile.TemporaryDirectory() as d:
+        src, dst = os.path.join(d, "numbers.txt"), os.path.join(d, "sorted.txt")
+        with open(src, "w") as f:
+            for start in range(0, N, 100_000):
+                f.write("\n".join(map(str, rng.random(min(100_000, N - start)).tolist())) + "\n")
+        print(f"{N:,} numbers, {os.path.getsize(src) / 2**20:,.0f} MB of text, {BUDGET / 2**20:.0f} MB budget")
+
+        start = time.perf_counter()
+        count = external_sort(src, dst, memory_bytes=BUDGET)
+        print(f"Sorted {count:,} numbers in {time.perf_counter() - start:.1f}s")
+        print(f"Peak memory: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10:,.0f} MB")
+
+        previous = -np.inf
+        for block in read_numbers(dst, np.float64, False, 1_000_000):
+            assert previous <= block[0] and np.all(block[:-1] <= block[1:])
+            previous = block[-1]
@@ -0,0 +1,136 @@
+# Quicksort vs Mergesort — counting mode
+# The same two algorithms as main.py, but with no events, colours or frames: they just
+# count comparisons and writes, so the counts can be collected for millions of elements
+# and plotted against n log n. The counts match what main.py's Metrics would show for
+# the same input.
+# Run: python counting.py
+
+import bisect
+import math
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+from main import Metrics
+
+SIZES = [1_000, 3_000, 10_000, 30_000, 100_000, 300_000, 1_000_000]
+DISTRIBUTIONS = ["random", "sorted", "reversed", "many duplicates"]
+DUPLICATE_VALUES = 10     # distinct values in the "many duplicates" input
+MAX_COMPARISONS = 1e8     # skip a run whose predicted comparison count is above this
+SEED = 42
+
+
+def make_input(kind, n, rng):
+    if kind == "random":
+        return rng.permutation(n).tolist()
+    if kind == "sorted":
+        return list(range(n))
+    if kind == "reversed":
+        return list(range(n, 0, -1))
+    if kind == "many duplicates":
+        return rng.integers(0, DUPLICATE_VALUES, n).tolist()
+    raise ValueError(f"unknown distribution {kind!r}")
+
+
+def quicksort_counts(values) -> Metrics:
+    # Lomuto partition with the last element as pivot, like quicksort_generator, but with
+    # an explicit stack: sorted input recurses n deep, far past Python's recursion limit
+    arr = list(values)
+    comparisons = writes = 0
+    stack = [(0, len(arr) - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        if lo >= hi:
+            continue
+        pivot = arr[hi]
+        i = lo
+        for j in range(lo, hi):
+            if arr[j] <= pivot:
+                if i != j:
+                    arr[i], arr[j] = arr[j], arr[i]
+                    writes += 2
+                i += 1
+        comparisons += hi - lo  # one per j
+        if i != hi:
+            arr[i], arr[hi] = arr[hi], arr[i]
+            writes += 2
+        stack.append((i + 1, hi))
+        stack.append((lo, i - 1))
+    return Metrics(comparisons, writes)
+
+
+def mergesort_counts(values) -> Metrics:
+    # Top-down, split the same way as mergesort_generator. A merge doesn't need to be
+    # stepped through to count it: it compares once per element placed until one side
+    # runs out, and the elements left over after that are found with a binary search.
+    # The merge itself is left to sorted(), which merges two sorted runs in C.
+    metrics = Metrics()
+
+    def sort(run):
+        if len(run) <= 1:
+            return run
+        mid = (len(run) - 1) // 2  # (lo + hi) // 2, relative to lo
+        left, right = sort(run[:mid + 1]), sort(run[mid + 1:])
+        if left[-1] <= right[-1]:
+            # left runs out first (ties go left); right[j] >= left[-1] are never compared
+            leftover = len(right) - bisect.bisect_left(right, left[-1])
+        else:
+            leftover = len(left) - bisect.bisect_right(left, right[-1])
+        metrics.comparisons += len(run) - leftover
+        metrics.writes += len(run)
+        return sorted(left + right)
+
+    sort(list(values))
+    return metrics
+
+
+ALGORITHMS = {"Quicksort": quicksort_counts, "Mergesort": mergesort_counts}
+
+
+def predicted_comparisons(history, n):
+    # Extrapolate from the last two runs with the growth exponent they show, so a series
+    # that has gone quadratic stops before it takes hours
+    if len(history) < 2:
+        return 0
+    (n0, c0), (n1, c1) = history[-2:]
+    slope = math.log(max(c1, 1) / max(c0, 1)) / math.log(n1 / n0)
+    return c1 * (n / n1) ** slope
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(SEED)
+    results = {}  # (algorithm, distribution) -> [(n, comparisons, writes)]
+
+    print(f"{'algorithm':>10} {'input':>16} {'n':>10} {'comparisons':>14} {'writes':>14} {'/ n log2 n':>10} {'time':>8}")
+    for kind in DISTRIBUTIONS:
+        for name, count in ALGORITHMS.items():
+            series = results.setdefault((name, kind), [])
+            for n in SIZES:
+                estimate = predicted_comparisons([(m, c) for m, c, _ in series], n)
+                if estimate > MAX_COMPARISONS:
+                    print(f"{name:>10} {kind:>16} {n:>10,}  skipped, about {estimate:.1e} comparisons")
+                    break
+                values = make_input(kind, n, rng)
+                start = time.perf_counter()
+                metrics = count(values)
+                elapsed = time.perf_counter() - start
+                series.append((n, metrics.comparisons, metrics.writes))
+                print(f"{name:>10} {kind:>16} {n:>10,} {metrics.comparisons:>14,} {metrics.writes:>14,} "
+                      f"{metrics.comparisons / (n * math.log2(n)):>10.2f} {elapsed:>7.2f}s")
+
+    fig, axes = plt.subplots(1, 2, figsize=(13, 6))
+    reference = np.array(SIZES, dtype=float)
+    for ax, column, label in ((axes[0], 1, "Comparisons"), (axes[1], 2, "Writes")):
+        ax.plot(reference, reference * np.log2(reference), "k--", lw=1, label="n log2 n")
+        ax.plot(reference, reference ** 2 / 2, "k:", lw=1, label="n² / 2")
+        for (name, kind), series in results.items():
+            ns = [row[0] for row in series]
+            ax.plot(ns, [row[column] for row in series], marker="o", ms=3,
+                    ls="-" if name == "Quicksort" else "--", label=f"{name}, {kind}")
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlabel("n")
+        ax.set_title(label)
+        ax.grid(True, which="both", alpha=0.3)
+    axes[0].legend(fontsize=8)
+    plt.tight_layout()
+    plt.show()
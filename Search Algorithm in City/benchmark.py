@@ -0,0 +1,44 @@
+import csv
+import statistics
+from search import ALGORITHMS, generate_city, find_path
+
+# Runs every algorithm headless over seeded random cities of increasing size, both the
+# usual 30% buildings and a more open 10% city, then compares expansions against A*.
+
+SIZES = [40, 100, 400, 1000, 2000, 4000]
+DENSITIES = [0.3, 0.1]
+SEEDS = [0, 1, 2]
+OUTPUT = "benchmark_results.csv"
+
+if __name__ == "__main__":
+    rows = []
+    print(f"{'size':>5} {'dens':>4} {'seed':>4} {'algo':>5} {'path len':>9} {'expanded':>11} {'peak frontier':>14} {'ms':>10}")
+    for size in SIZES:
+        for density in DENSITIES:
+            for seed in SEEDS:
+                city, start, goal = generate_city(size, density, seed=seed)
+                for name in ALGORITHMS:
+                    res = find_path(city, start, goal, name)
+                    row = {"size": size, "density": density, "seed": seed, "algorithm": name,
+                           "path_len": len(res.path), "expanded": res.expanded,
+                           "peak_frontier": res.peak_frontier, "ms": round(res.wall_time * 1000, 2)}
+                    rows.append(row)
+                    print(f"{size:>5} {density:>4} {seed:>4} {name:>5} {len(res.path):>9} {res.expanded:>11,} "
+                          f"{res.peak_frontier:>14,} {row['ms']:>10.1f}")
+
+    with open(OUTPUT, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Saved to {OUTPUT}")
+
+    # Median over seeds, and how many times fewer nodes than A* each algorithm expanded
+    print(f"\n{'size':>5} {'dens':>4} {'algo':>5} {'expanded':>11} {'vs A*':>7} {'ms':>10}")
+    for size in SIZES:
+        for density in DENSITIES:
+            cell = [r for r in rows if r["size"] == size and r["density"] == density]
+            base = statistics.median(r["expanded"] for r in cell if r["algorithm"] == "A*")
+            for name in ALGORITHMS:
+                expanded = statistics.median(r["expanded"] for r in cell if r["algorithm"] == name)
+                ms = statistics.median(r["ms"] for r in cell if r["algorithm"] == name)
+                print(f"{size:>5} {density:>4} {name:>5} {expanded:>11,.0f} {base / max(expanded, 1):>6.1f}x {ms:>10.1f}")
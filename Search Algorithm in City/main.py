@@ -1,7 +1,5 @@
 import pygame
-import random
-from collections import deque
-import heapq
+from search import ALGORITHMS, generate_city
 
 # Constants
 WIDTH, HEIGHT = 800, 800
@@ -17,57 +15,106 @@ RED = (255, 0, 0)
 BLUE = (0, 0, 255)
 YELLOW = (255, 255, 0)
 
-# Generate random city grid
-def generate_city():
-    grid = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-    for i in range(GRID_SIZE):
-        for j in range(GRID_SIZE):
-            if random.random() < 0.3:  # 30% chance of being a building (obstacle)
-                grid[i][j] = 1
-    # Choose start and goal on open roads
-    start = (random.randint(0, GRID_SIZE - 1), random.randint(0, GRID_SIZE - 1))
-    while grid[start[0]][start[1]] == 1:
-        start = (random.randint(0, GRID_SIZE - 1), random.randint(0, GRID_SIZE - 1))
-    goal = (random.randint(0, GRID_SIZE - 1), random.randint(0, GRID_SIZE - 1))
-    while grid[goal[0]][goal[1]] == 1 or goal == start:
-        goal = (random.randint(0, GRID_SIZE - 1), random.randint(0, GRID_SIZE - 1))
-    return grid, start, goal
-
-# Draw the grid
-def draw_grid(screen, grid, closed, frontier_set, path, start, goal):
-    screen.fill(WHITE)
-    for i in range(GRID_SIZE):
-        for j in range(GRID_SIZE):
-            rect = pygame.Rect(j * CELL_SIZE, i * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            if (i, j) == start:
-                pygame.draw.rect(screen, GREEN, rect)
-            elif (i, j) == goal:
-                pygame.draw.rect(screen, RED, rect)
-            elif (i, j) in path:
-                pygame.draw.rect(screen, YELLOW, rect)
-            elif (i, j) in closed:
-                pygame.draw.rect(screen, BLUE, rect)
-            elif (i, j) in frontier_set:
-                pygame.draw.rect(screen, GRAY, rect)
-            elif grid[i][j] == 1:
-                pygame.draw.rect(screen, BLACK, rect)
-            else:
-                pygame.draw.rect(screen, WHITE, rect)
-            pygame.draw.rect(screen, BLACK, rect, 1)  # Border
-
-# Get neighbors (up, down, left, right)
-def get_neighbors(pos):
-    i, j = pos
-    neighbors = []
-    for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-        ni, nj = i + di, j + dj
-        if 0 <= ni < GRID_SIZE and 0 <= nj < GRID_SIZE:
-            neighbors.append((ni, nj))
-    return neighbors
-
-# Heuristic for A* (Manhattan distance)
-def heuristic(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+# Cell states the renderer keeps track of. Closed is a bit on top of road/building so
+# the closed and building arrays can be combined in one go; later ones win when drawing.
+ROAD, BUILDING, CLOSED, CLOSED_BUILDING, FRONTIER, PATH, START, GOAL = range(8)
+STATE_COLORS = {CLOSED: BLUE, CLOSED_BUILDING: BLUE, FRONTIER: GRAY, PATH: YELLOW, START: GREEN, GOAL: RED}
+TEXT_BAND = pygame.Rect(0, 0, WIDTH, 100)  # where the help text goes, redrawn every frame
+
+
+class GridRenderer:
+    '''
+    Draws the grid onto its own surface and only repaints cells whose state changed since
+    the last frame. Roads and buildings come from a cached background, so a cell going
+    back to plain road is one small blit. draw() returns the screen rects that changed,
+    for pygame.display.update().
+    '''
+    def __init__(self, screen, city, start, goal):
+        self.screen = screen
+        self.surface = pygame.Surface(screen.get_size())
+        self.border = CELL_SIZE >= 4  # on tiny cells the borders would be all you could see
+        self.reset(city, start, goal)
+
+    def reset(self, city, start, goal):
+        # New city: rebuild the background and repaint everything
+        self.city, self.start, self.goal = city, start, goal
+        self.background = pygame.Surface(self.screen.get_size())
+        self.background.fill(WHITE)
+        for idx in range(len(city.cells)):
+            self.paint_background(idx)
+        self.surface.blit(self.background, (0, 0))
+        self.shown = bytearray(city.cells)
+        self.full_redraw = True
+
+    def cell_rect(self, idx):
+        i, j = divmod(idx, self.city.cols)
+        return pygame.Rect(j * CELL_SIZE, i * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+
+    def paint_background(self, idx):
+        rect = self.cell_rect(idx)
+        self.background.fill(BLACK if self.city.cells[idx] else WHITE, rect)
+        if self.border:
+            pygame.draw.rect(self.background, BLACK, rect, 1)
+
+    def cell_changed(self, pos):
+        # A building was added or removed
+        self.paint_background(self.city.index(pos))
+
+    def target_states(self, search, path):
+        city = self.city
+        n = len(city.cells)
+        if search is None:
+            states = bytearray(city.cells)
+        else:
+            # closed * 2 + building, byte by byte, done as two big ints so it runs in C
+            bits = int.from_bytes(search.closed, "big") << 1 | int.from_bytes(city.cells, "big")
+            states = bytearray(bits.to_bytes(n, "big"))
+            if not search.done:
+                for idx in search.frontier():
+                    if states[idx] < CLOSED:
+                        states[idx] = FRONTIER
+        for pos in path:
+            states[city.index(pos)] = PATH
+        states[city.index(self.start)] = START
+        states[city.index(self.goal)] = GOAL
+        return states
+
+    def paint(self, idx, state):
+        rect = self.cell_rect(idx)
+        if state <= BUILDING:
+            self.surface.blit(self.background, rect, rect)
+        else:
+            self.surface.fill(STATE_COLORS[state], rect)
+            if self.border:
+                pygame.draw.rect(self.surface, BLACK, rect, 1)
+        return rect
+
+    def draw(self, search, path, lines):
+        states = self.target_states(search, path)
+        shown, cols = self.shown, self.city.cols
+        dirty = []
+        # Compare a row at a time (in C) and only look at cells in rows that differ
+        for a in range(0, len(states), cols):
+            b = a + cols
+            if states[a:b] != shown[a:b]:
+                for idx in range(a, b):
+                    if states[idx] != shown[idx]:
+                        dirty.append(self.paint(idx, states[idx]))
+        self.shown = states
+
+        if self.full_redraw:
+            self.screen.blit(self.surface, (0, 0))
+            self.full_redraw = False
+            dirty = [self.screen.get_rect()]
+        else:
+            for rect in dirty:
+                self.screen.blit(self.surface, rect, rect)
+        # The text sits on top of the grid, so its band is redrawn every frame
+        self.screen.blit(self.surface, TEXT_BAND, TEXT_BAND)
+        for k, text in enumerate(lines):
+            self.screen.blit(text, (10, 10 + 30 * k))
+        dirty.append(TEXT_BAND)
+        return dirty
 
 # Main function
 def main():
@@ -75,20 +122,15 @@ def main():
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Search Algorithms Simulation in City")
     clock = pygame.time.Clock()
+    font = pygame.font.SysFont(None, 30)
 
-    grid, start, goal = generate_city()
+    city, start, goal = generate_city(GRID_SIZE)
+    renderer = GridRenderer(screen, city, start, goal)
     algorithm = 'BFS'
-    searching = False
+    search = None  # the running (or finished) Search from search.py
     path = []
     frame_delay = 0
 
-    # Variables for search state
-    open_queue = None  # For BFS/DFS deque or list, for A* priority queue
-    open_set = None
-    closed = None
-    parent = None
-    g_score = None
-
     running = True
     while running:
         for event in pygame.event.get():
@@ -96,123 +138,58 @@ def main():
                 running = False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:
-                    grid, start, goal = generate_city()
-                    searching = False
+                    city, start, goal = generate_city(GRID_SIZE)
+                    renderer.reset(city, start, goal)
+                    search = None
                     path = []
-                    open_queue = None
-                    open_set = None
-                    closed = None
-                    parent = None
-                    g_score = None
-                if not searching:
+                if search is None or search.done:
                     if event.key == pygame.K_b:
                         algorithm = 'BFS'
                     elif event.key == pygame.K_d:
                         algorithm = 'DFS'
                     elif event.key == pygame.K_a:
                         algorithm = 'A*'
+                    elif event.key == pygame.K_j:
+                        algorithm = 'JPS'
+                    elif event.key == pygame.K_i:
+                        algorithm = 'Bi-A*'
+                    elif event.key == pygame.K_l:
+                        algorithm = 'D* Lite'
                     elif event.key == pygame.K_s:
-                        searching = True
-                        closed = set()
-                        parent = {start: None}
+                        search = ALGORITHMS[algorithm](city, start, goal)
                         path = []
-                        if algorithm == 'BFS':
-                            open_queue = deque([start])
-                            open_set = set([start])
-                        elif algorithm == 'DFS':
-                            open_queue = [start]  # Stack
-                            open_set = set([start])
-                        elif algorithm == 'A*':
-                            open_queue = []
-                            g_score = {start: 0}
-                            f_score = heuristic(start, goal)
-                            heapq.heappush(open_queue, (f_score, start))
-                            # For A*, no open_set, as multiples allowed
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                # Click a cell to add or remove a building
+                pos = (event.pos[1] // CELL_SIZE, event.pos[0] // CELL_SIZE)
+                if pos[0] < city.rows and pos[1] < city.cols and pos != start and pos != goal:
+                    if hasattr(search, "toggle"):
+                        search.toggle(pos)  # D* Lite repairs its existing search
+                    else:
+                        city.cells[city.index(pos)] ^= 1
+                        search = None
+                    renderer.cell_changed(pos)
+                    path = []
 
+        searching = search is not None and not search.done
         if searching:
             if frame_delay % 5 == 0:  # Slow down animation
-                found = False
-                if algorithm in ['BFS', 'DFS']:
-                    if open_queue:
-                        if algorithm == 'BFS':
-                            current = open_queue.popleft()
-                        else:
-                            current = open_queue.pop()
-                        open_set.remove(current)
-                        closed.add(current)
-                        if current == goal:
-                            found = True
-                        for neigh in get_neighbors(current):
-                            if grid[neigh[0]][neigh[1]] == 1:
-                                continue
-                            if neigh not in closed and neigh not in open_set:
-                                open_queue.append(neigh)
-                                open_set.add(neigh)
-                                parent[neigh] = current
-                elif algorithm == 'A*':
-                    if open_queue:
-                        f, current = heapq.heappop(open_queue)
-                        if current in closed:
-                            pass
-                        elif f > g_score.get(current, float('inf')) + heuristic(current, goal):
-                            pass
-                        else:
-                            closed.add(current)
-                            if current == goal:
-                                found = True
-                            for neigh in get_neighbors(current):
-                                if grid[neigh[0]][neigh[1]] == 1:
-                                    continue
-                                tentative_g = g_score[current] + 1
-                                if tentative_g < g_score.get(neigh, float('inf')):
-                                    parent[neigh] = current
-                                    g_score[neigh] = tentative_g
-                                    new_f = tentative_g + heuristic(neigh, goal)
-                                    heapq.heappush(open_queue, (new_f, neigh))
-                if found:
-                    searching = False
-                if not open_queue:
-                    searching = False
+                search.step()
+                if search.done:
+                    path = search.path()
             frame_delay += 1
 
-        # Reconstruct path if search done and goal reached
-        if not searching and parent is not None and goal in parent:
-            current = goal
-            path = []
-            while current is not None:
-                path.append(current)
-                current = parent.get(current)
-            path.reverse()
-            if path[0] != start:
-                path = []
-
-        # Prepare frontier_set for drawing
-        if searching:
-            if algorithm in ['BFS', 'DFS']:
-                frontier_set = open_set
-            else:
-                frontier_set = set([pos for _, pos in open_queue])
-        else:
-            frontier_set = set()
-
         # Draw
-        draw_grid(screen, grid, closed or set(), frontier_set, path, start, goal)
-
-        # Display text
-        font = pygame.font.SysFont(None, 30)
-        text = font.render(f"Algorithm: {algorithm} (B:BFS, D:DFS, A:A*)", True, BLACK)
-        screen.blit(text, (10, 10))
-        text = font.render("Press S to start, R to regenerate city", True, BLACK)
-        screen.blit(text, (10, 40))
-        if searching:
-            text = font.render("Searching...", True, BLACK)
+        if search is not None and not search.done:
+            status = ("Searching...", BLACK)
         elif path:
-            text = font.render("Path found!", True, GREEN)
+            status = ("Path found!", GREEN)
         else:
-            text = font.render("No path found", True, RED)
-        screen.blit(text, (10, 70))
-
-        pygame.display.flip()
+            status = ("No path found", RED)
+        lines = [(f"Algorithm: {algorithm} (B:BFS, D:DFS, A:A*, J:JPS, I:Bi-A*, L:D* Lite)", BLACK),
+                 ("S to start, R to regenerate city, click to toggle buildings", BLACK),
+                 status]
+        dirty = renderer.draw(search, path, [font.render(text, True, color) for text, color in lines])
+        pygame.display.update(dirty)
         clock.tick(30)
 
     pygame.quit()
@@ -0,0 +1,230 @@
+'''
+Answering lots of start/goal queries on one city. Two things get precomputed and reused:
+  - a handful of landmark distance maps, giving A* a much better heuristic than Manhattan
+    (ALT: by the triangle inequality, |d(L, goal) - d(L, n)| never overestimates d(n, goal))
+  - full BFS distance maps from popular goals, kept in an LRU cache. With one of those,
+    any query to that goal is a single array lookup.
+The service assumes the city doesn't change underneath it; call invalidate() after edits.
+'''
+
+import random
+import time
+from array import array
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from search import AStar, City, generate_city, manhattan
+
+NUM_LANDMARKS = 8
+CACHE_SIZE = 32      # distance maps kept (each is 4 bytes per cell)
+HOT_AFTER = 4        # queries to the same goal before it's worth a full distance map
+
+
+def distance_map(city: City, source: int) -> array:
+    '''BFS distance from source to every cell (-1 for buildings and unreachable cells).'''
+    cells, cols = city.cells, city.cols
+    n = len(cells)
+    dist = array("i", [-1]) * n
+    dist[source] = 0
+    frontier = [source]
+    d = 0
+    while frontier:
+        d += 1
+        nxt = []
+        for idx in frontier:
+            j = idx % cols
+            for neigh in (idx - cols if idx >= cols else -1, idx + cols if idx + cols < n else -1,
+                          idx - 1 if j > 0 else -1, idx + 1 if j < cols - 1 else -1):
+                if neigh >= 0 and dist[neigh] < 0 and not cells[neigh]:
+                    dist[neigh] = d
+                    nxt.append(neigh)
+        frontier = nxt
+    return dist
+
+
+def path_from_map(city: City, dist: array, start: int) -> list[tuple[int, int]]:
+    # Walk downhill from start to the map's source
+    if dist[start] < 0:
+        return []
+    current = start
+    out = [city.pos(current)]
+    while dist[current]:
+        current = next(n for n in city.neighbors(current) if dist[n] == dist[current] - 1)
+        out.append(city.pos(current))
+    return out
+
+
+class ALTAStar(AStar):
+    name = "ALT A*"
+
+    def __init__(self, city, start, goal, landmarks: list[array]):
+        # (distance map, that landmark's distance to the goal) for landmarks that can reach the goal
+        goal_idx = city.index(goal)
+        self.bounds = [(dist, dist[goal_idx]) for dist in landmarks if dist[goal_idx] >= 0]
+        super().__init__(city, start, goal)
+
+    def heuristic(self, idx: int) -> int:
+        best = manhattan(idx, self.goal, self.city.cols)
+        for dist, to_goal in self.bounds:
+            d = dist[idx]
+            if d >= 0 and abs(to_goal - d) > best:
+                best = abs(to_goal - d)
+        return best
+
+
+@dataclass
+class QueryStats:
+    queries: int = 0
+    batches: int = 0
+    hits: int = 0         # answered from a distance map that was already cached
+    shared: int = 0       # answered from a map batch() built for an earlier query in the same group
+    maps_built: int = 0
+    evictions: int = 0
+    searches: int = 0     # answered by an ALT A* search
+    busy_s: float = 0.0   # time spent inside query()/batch(), including building maps
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / max(self.queries, 1)
+
+    @property
+    def throughput(self) -> float:
+        # queries per second
+        return self.queries / self.busy_s if self.busy_s else 0.0
+
+
+class QueryService:
+    def __init__(self, city: City, num_landmarks: int = NUM_LANDMARKS, cache_size: int = CACHE_SIZE,
+                 hot_after: int = HOT_AFTER, seed: int | None = None):
+        self.city = city
+        self.num_landmarks = num_landmarks
+        self.cache_size = cache_size
+        self.hot_after = hot_after
+        self.rng = random.Random(seed)
+        self.cache: OrderedDict[int, array] = OrderedDict()  # goal index -> distance map, oldest first
+        self.goal_counts = Counter()
+        self.stats = QueryStats()
+        self.landmarks = self.pick_landmarks()
+
+    def pick_landmarks(self) -> list[array]:
+        '''
+        Farthest-point landmarks: each new one is the open cell furthest from all the
+        landmarks so far, which spreads them round the edge of the city where they help most.
+        '''
+        cells = self.city.cells
+        open_cells = [i for i in range(len(cells)) if not cells[i]]
+        if not open_cells or not self.num_landmarks:
+            return []
+        first = distance_map(self.city, self.rng.choice(open_cells))
+        nearest = first  # distance to the closest landmark so far
+        landmarks = []
+        for _ in range(self.num_landmarks):
+            far = max(range(len(nearest)), key=nearest.__getitem__)
+            if nearest[far] <= 0:
+                break
+            dist = distance_map(self.city, far)
+            landmarks.append(dist)
+            nearest = array("i", (min(a, b) if b >= 0 else a for a, b in zip(nearest, dist)))
+        return landmarks
+
+    def invalidate(self):
+        # The city changed: every cached map and landmark is now wrong
+        self.cache.clear()
+        self.goal_counts.clear()
+        self.landmarks = self.pick_landmarks()
+
+    def cached_map(self, goal: int) -> array | None:
+        dist = self.cache.get(goal)
+        if dist is not None:
+            self.cache.move_to_end(goal)
+        return dist
+
+    def build_map(self, goal: int) -> array:
+        dist = distance_map(self.city, goal)
+        self.cache[goal] = dist
+        self.stats.maps_built += 1
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+            self.stats.evictions += 1
+        return dist
+
+    def answer(self, start: int, goal: int, dist: array | None, want_path: bool):
+        self.stats.queries += 1
+        if dist is None:
+            self.stats.searches += 1
+            search = ALTAStar(self.city, self.city.pos(start), self.city.pos(goal), self.landmarks).run()
+            return search.path() if want_path else (search.g_score[goal] if search.found else -1)
+        return path_from_map(self.city, dist, start) if want_path else dist[start]
+
+    def query(self, start: tuple[int, int], goal: tuple[int, int], want_path: bool = False):
+        '''Path length (-1 if unreachable), or the path itself with want_path.'''
+        t0 = time.perf_counter()
+        s, g = self.city.index(start), self.city.index(goal)
+        self.goal_counts[g] += 1
+        dist = self.cached_map(g)
+        if dist is not None:
+            self.stats.hits += 1
+        elif self.goal_counts[g] >= self.hot_after:
+            dist = self.build_map(g)
+        out = self.answer(s, g, dist, want_path)
+        self.stats.busy_s += time.perf_counter() - t0
+        return out
+
+    def batch(self, pairs: list[tuple[tuple[int, int], tuple[int, int]]], want_path: bool = False) -> list:
+        '''
+        Answers a list of (start, goal) queries, results in the same order. Queries are
+        grouped by goal first, so once a goal has been asked for hot_after times (counting
+        this batch) its distance map is built once and shared by the whole group.
+        '''
+        t0 = time.perf_counter()
+        index = self.city.index
+        by_goal: dict[int, list[int]] = {}
+        for k, (_, goal) in enumerate(pairs):
+            by_goal.setdefault(index(goal), []).append(k)
+
+        out = [None] * len(pairs)
+        # Goals with a cached map go first, so building new maps can't evict them
+        # before they're used; then the most asked-for goals
+        order = sorted(by_goal, key=lambda g: (g not in self.cache, -len(by_goal[g])))
+        for g in order:
+            ks = by_goal[g]
+            self.goal_counts[g] += len(ks)
+            dist = self.cached_map(g)
+            if dist is not None:
+                self.stats.hits += len(ks)
+            elif self.goal_counts[g] >= self.hot_after:
+                dist = self.build_map(g)
+                # not hits: the map wasn't cached when these were asked, it just got built
+                # for the first of them, which query() would also count as a miss
+                self.stats.shared += len(ks) - 1
+            for k in ks:
+                out[k] = self.answer(index(pairs[k][0]), g, dist, want_path)
+        self.stats.batches += 1
+        self.stats.busy_s += time.perf_counter() - t0
+        return out
+
+
+if __name__ == "__main__":
+    SIZE, QUERIES, GOALS = 400, 5000, 40
+    city, _, _ = generate_city(SIZE, seed=0)
+    rng = random.Random(0)
+    open_cells = [city.pos(i) for i in range(len(city.cells)) if not city.cells[i]]
+    # A few goals are much more popular than the rest, like real destinations
+    goals = rng.sample(open_cells, GOALS)
+    weights = [1 / (k + 1) for k in range(GOALS)]
+    pairs = [(rng.choice(open_cells), rng.choices(goals, weights)[0]) for _ in range(QUERIES)]
+
+    t0 = time.perf_counter()
+    service = QueryService(city, seed=0)
+    print(f"{len(service.landmarks)} landmarks on a {SIZE}x{SIZE} city in {time.perf_counter() - t0:.2f}s")
+
+    for k in range(0, QUERIES, 500):
+        service.batch(pairs[k:k + 500])
+    s = service.stats
+    print(f"{s.queries} queries in {s.batches} batches: {s.throughput:,.0f} queries/s, hit rate {s.hit_rate:.1%}, "
+          f"{s.shared} shared a map built in their batch, {s.maps_built} maps built, {s.evictions} evicted, {s.searches} ALT searches")
+
+    # Same queries one at a time with plain A*, for comparison
+    t0 = time.perf_counter()
+    for start, goal in pairs[:500]:
+        AStar(city, start, goal).run()
+    print(f"Plain A*, one query at a time: {500 / (time.perf_counter() - t0):,.0f} queries/s")
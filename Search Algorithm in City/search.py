@@ -0,0 +1,568 @@
+'''
+Headless versions of the searches in main.py. The city is a flat bytearray (1 byte per
+cell, 1 = building) and cells are referred to by their flat index i * cols + j, so a
+4000x4000 city is 16 MB instead of 16 million Python ints in nested lists.
+
+Each algorithm is a class with a step() that does one expansion, which is what the
+pygame view calls every few frames, and run() which just steps until it's done.
+'''
+
+import heapq
+import random
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+
+BUILDING_DENSITY = 0.3  # chance of a cell being a building (obstacle)
+
+
+class City:
+    __slots__ = ("rows", "cols", "cells")
+
+    def __init__(self, rows: int, cols: int, cells: bytearray | None = None):
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells if cells is not None else bytearray(rows * cols)
+
+    def index(self, pos: tuple[int, int]) -> int:
+        return pos[0] * self.cols + pos[1]
+
+    def pos(self, idx: int) -> tuple[int, int]:
+        return divmod(idx, self.cols)
+
+    def is_building(self, pos: tuple[int, int]) -> bool:
+        return self.cells[pos[0] * self.cols + pos[1]] == 1
+
+    def neighbors(self, idx: int) -> list[int]:
+        # Same order as get_neighbors in main.py: up, down, left, right
+        cols = self.cols
+        out = []
+        if idx >= cols:
+            out.append(idx - cols)
+        if idx + cols < len(self.cells):
+            out.append(idx + cols)
+        j = idx % cols
+        if j > 0:
+            out.append(idx - 1)
+        if j < cols - 1:
+            out.append(idx + 1)
+        return out
+
+
+def generate_city(size: int, density: float = BUILDING_DENSITY, seed: int | None = None):
+    '''
+    Random size x size city plus a start and goal on open road. Uses random bytes and a
+    translate table rather than one random() call per cell so big cities are quick to make.
+    '''
+    rng = random.Random(seed)
+    cutoff = round(density * 256)
+    table = bytes(1 if b < cutoff else 0 for b in range(256))
+    city = City(size, size, bytearray(rng.randbytes(size * size).translate(table)))
+
+    # Choose start and goal on open roads
+    def random_open():
+        while True:
+            pos = (rng.randrange(size), rng.randrange(size))
+            if not city.is_building(pos):
+                return pos
+
+    start = random_open()
+    goal = random_open()
+    while goal == start:
+        goal = random_open()
+    return city, start, goal
+
+
+# Heuristic for A* (Manhattan distance), on flat indices
+def manhattan(a: int, b: int, cols: int) -> int:
+    ai, aj = divmod(a, cols)
+    bi, bj = divmod(b, cols)
+    return abs(ai - bi) + abs(aj - bj)
+
+
+class Search:
+    name = ""
+
+    def __init__(self, city: City, start: tuple[int, int], goal: tuple[int, int]):
+        self.city = city
+        self.start = city.index(start)
+        self.goal = city.index(goal)
+        n = len(city.cells)
+        self.parent = array("i", [-1]) * n
+        self.closed = bytearray(n)
+        self.expanded = 0
+        self.peak_frontier = 0
+        self.done = False
+        self.found = False
+
+    def step(self) -> bool:
+        '''Expand one node. Returns False once the search has finished.'''
+        raise NotImplementedError
+
+    def frontier(self) -> set[int]:
+        raise NotImplementedError
+
+    def run(self):
+        step = self.step
+        while step():
+            pass
+        return self
+
+    def path(self) -> list[tuple[int, int]]:
+        if not self.found:
+            return []
+        out = []
+        current = self.goal
+        while current != -1:
+            out.append(self.city.pos(current))
+            current = self.parent[current]
+        out.reverse()
+        return out
+
+
+class BFS(Search):
+    name = "BFS"
+
+    def __init__(self, city, start, goal):
+        super().__init__(city, start, goal)
+        self.open_queue = deque([self.start])
+        self.seen = bytearray(len(city.cells))  # on the open queue or already closed
+        self.seen[self.start] = 1
+
+    def pop(self) -> int:
+        return self.open_queue.popleft()
+
+    def step(self) -> bool:
+        if self.done:
+            return False
+        if not self.open_queue:
+            self.done = True
+            return False
+        current = self.pop()
+        self.closed[current] = 1
+        self.expanded += 1
+        if current == self.goal:
+            self.found = self.done = True
+            return False
+        cells, seen, parent = self.city.cells, self.seen, self.parent
+        for neigh in self.city.neighbors(current):
+            if cells[neigh] or seen[neigh]:
+                continue
+            seen[neigh] = 1
+            parent[neigh] = current
+            self.open_queue.append(neigh)
+        if len(self.open_queue) > self.peak_frontier:
+            self.peak_frontier = len(self.open_queue)
+        return True
+
+    def frontier(self) -> set[int]:
+        return set(self.open_queue)
+
+
+class DFS(BFS):
+    name = "DFS"
+
+    def pop(self) -> int:
+        return self.open_queue.pop()  # Stack
+
+
+class AStar(Search):
+    name = "A*"
+
+    def __init__(self, city, start, goal):
+        super().__init__(city, start, goal)
+        self.g_score = array("i", [2**31 - 1]) * len(city.cells)
+        self.g_score[self.start] = 0
+        self.open_queue = [(self.heuristic(self.start), self.start)]
+        # For A*, no open_set, as multiples allowed
+
+    def heuristic(self, idx: int) -> int:
+        return manhattan(idx, self.goal, self.city.cols)
+
+    def step(self) -> bool:
+        if self.done:
+            return False
+        if not self.open_queue:
+            self.done = True
+            return False
+        goal, g_score, h = self.goal, self.g_score, self.heuristic
+        f, current = heapq.heappop(self.open_queue)
+        if self.closed[current] or f > g_score[current] + h(current):
+            return True  # stale duplicate
+        self.closed[current] = 1
+        self.expanded += 1
+        if current == goal:
+            self.found = self.done = True
+            return False
+        cells, parent = self.city.cells, self.parent
+        tentative_g = g_score[current] + 1
+        for neigh in self.city.neighbors(current):
+            if cells[neigh]:
+                continue
+            if tentative_g < g_score[neigh]:
+                parent[neigh] = current
+                g_score[neigh] = tentative_g
+                heapq.heappush(self.open_queue, (tentative_g + h(neigh), neigh))
+        if len(self.open_queue) > self.peak_frontier:
+            self.peak_frontier = len(self.open_queue)
+        return True
+
+    def frontier(self) -> set[int]:
+        return {pos for _, pos in self.open_queue}
+
+
+# Directions for JPS, stored per node as the way we arrived (0 = start, no direction yet)
+UP, DOWN, LEFT, RIGHT = 1, 2, 3, 4
+VERTICAL = {UP: -1, DOWN: 1}
+HORIZONTAL = {LEFT: -1, RIGHT: 1}
+
+
+class JPS(Search):
+    '''
+    Jump Point Search for 4-connected grids. On a uniform-cost grid there are loads of
+    equally short paths through open space; JPS only considers the "horizontal first"
+    one. From a node it scans in a straight line and only stops (creating a jump point)
+    at the goal, or where a turn becomes necessary:
+      - scanning vertically, a side cell is open but the cell behind it is blocked
+        (the only short way into that side cell is to turn here)
+      - scanning horizontally, a vertical scan from this cell finds a jump point
+    Only jump points go on the open list, so far fewer nodes get expanded than plain A*,
+    at the cost of the line scans in between.
+    '''
+    name = "JPS"
+
+    def __init__(self, city, start, goal):
+        super().__init__(city, start, goal)
+        self.g_score = array("i", [2**31 - 1]) * len(city.cells)
+        self.g_score[self.start] = 0
+        self.came_from_dir = bytearray(len(city.cells))
+        self.open_queue = [(manhattan(self.start, self.goal, city.cols), self.start)]
+        self.scanned = 0  # cells looked at by the line scans
+
+    def jump_vertical(self, i: int, j: int, di: int) -> int:
+        cells, cols, rows, goal = self.city.cells, self.city.cols, self.city.rows, self.goal
+        while True:
+            i += di
+            if i < 0 or i >= rows:
+                return -1
+            idx = i * cols + j
+            if cells[idx]:
+                return -1
+            self.scanned += 1
+            if idx == goal:
+                return idx
+            behind = idx - di * cols
+            # forced horizontal neighbours
+            if j > 0 and not cells[idx - 1] and cells[behind - 1]:
+                return idx
+            if j < cols - 1 and not cells[idx + 1] and cells[behind + 1]:
+                return idx
+
+    def jump_horizontal(self, i: int, j: int, dj: int) -> int:
+        cells, cols, goal = self.city.cells, self.city.cols, self.goal
+        while True:
+            j += dj
+            if j < 0 or j >= cols:
+                return -1
+            idx = i * cols + j
+            if cells[idx]:
+                return -1
+            self.scanned += 1
+            if idx == goal:
+                return idx
+            if self.jump_vertical(i, j, -1) != -1 or self.jump_vertical(i, j, 1) != -1:
+                return idx
+
+    def directions(self, idx: int) -> list[int]:
+        arrived = self.came_from_dir[idx]
+        if arrived == 0:
+            return [UP, DOWN, LEFT, RIGHT]
+        if arrived in HORIZONTAL:
+            # keep going, or turn either way
+            return [arrived, UP, DOWN]
+        # vertical: keep going, and only turn sideways if it's forced
+        cells, cols = self.city.cells, self.city.cols
+        j = idx % cols
+        behind = idx - VERTICAL[arrived] * cols
+        dirs = [arrived]
+        if j > 0 and not cells[idx - 1] and cells[behind - 1]:
+            dirs.append(LEFT)
+        if j < cols - 1 and not cells[idx + 1] and cells[behind + 1]:
+            dirs.append(RIGHT)
+        return dirs
+
+    def step(self) -> bool:
+        if self.done:
+            return False
+        if not self.open_queue:
+            self.done = True
+            return False
+        cols, goal, g_score = self.city.cols, self.goal, self.g_score
+        f, current = heapq.heappop(self.open_queue)
+        if self.closed[current] or f > g_score[current] + manhattan(current, goal, cols):
+            return True  # stale duplicate
+        self.closed[current] = 1
+        self.expanded += 1
+        if current == goal:
+            self.found = self.done = True
+            return False
+        i, j = divmod(current, cols)
+        for d in self.directions(current):
+            if d in VERTICAL:
+                nxt = self.jump_vertical(i, j, VERTICAL[d])
+            else:
+                nxt = self.jump_horizontal(i, j, HORIZONTAL[d])
+            if nxt == -1:
+                continue
+            tentative_g = g_score[current] + manhattan(current, nxt, cols)
+            if tentative_g < g_score[nxt]:
+                g_score[nxt] = tentative_g
+                self.parent[nxt] = current
+                self.came_from_dir[nxt] = d
+                heapq.heappush(self.open_queue, (tentative_g + manhattan(nxt, goal, cols), nxt))
+        if len(self.open_queue) > self.peak_frontier:
+            self.peak_frontier = len(self.open_queue)
+        return True
+
+    def frontier(self) -> set[int]:
+        return {pos for _, pos in self.open_queue}
+
+    def path(self) -> list[tuple[int, int]]:
+        # Parents are jump points, so fill in the straight segments between them
+        jumps = super().path()
+        if not jumps:
+            return []
+        out = [jumps[0]]
+        for (i1, j1) in jumps[1:]:
+            i0, j0 = out[-1]
+            di = (i1 > i0) - (i1 < i0)
+            dj = (j1 > j0) - (j1 < j0)
+            while (i0, j0) != (i1, j1):
+                i0, j0 = i0 + di, j0 + dj
+                out.append((i0, j0))
+        return out
+
+
+class BidirectionalAStar(Search):
+    '''
+    Two A* searches, one from the start towards the goal and one from the goal towards
+    the start, always expanding whichever side has the smaller open list. Every time a
+    side reaches a cell the other side already has a distance for, that's a candidate
+    path; we can stop once either side's best f-value is no better than the best candidate.
+    '''
+    name = "Bi-A*"
+
+    def __init__(self, city, start, goal):
+        super().__init__(city, start, goal)
+        n = len(city.cells)
+        inf = 2**31 - 1
+        # index 0 = forward (from start), 1 = backward (from goal)
+        self.g = [array("i", [inf]) * n, array("i", [inf]) * n]
+        self.parents = [self.parent, array("i", [-1]) * n]
+        self.closed_side = [bytearray(n), bytearray(n)]
+        self.targets = [self.goal, self.start]
+        self.g[0][self.start] = 0
+        self.g[1][self.goal] = 0
+        self.open = [[(manhattan(self.start, self.goal, city.cols), self.start)],
+                     [(manhattan(self.goal, self.start, city.cols), self.goal)]]
+        self.best = inf  # cost of the best start-goal path found so far
+        self.meet = -1
+        if self.start == self.goal:
+            # both sides already share this cell at g=0, and no relaxation would record it
+            self.best = 0
+            self.meet = self.start
+
+    def step(self) -> bool:
+        if self.done:
+            return False
+        fwd, bwd = self.open
+        if not fwd or not bwd or max(fwd[0][0], bwd[0][0]) >= self.best:
+            self.found = self.meet != -1
+            self.done = True
+            return False
+
+        side = 0 if len(fwd) <= len(bwd) else 1
+        heap, g, other_g = self.open[side], self.g[side], self.g[1 - side]
+        parent, closed, target = self.parents[side], self.closed_side[side], self.targets[side]
+        cols = self.city.cols
+        f, current = heapq.heappop(heap)
+        if closed[current] or f > g[current] + manhattan(current, target, cols):
+            return True  # stale duplicate
+        closed[current] = 1
+        self.closed[current] = 1
+        self.expanded += 1
+
+        cells = self.city.cells
+        tentative_g = g[current] + 1
+        for neigh in self.city.neighbors(current):
+            if cells[neigh]:
+                continue
+            if tentative_g < g[neigh]:
+                parent[neigh] = current
+                g[neigh] = tentative_g
+                heapq.heappush(heap, (tentative_g + manhattan(neigh, target, cols), neigh))
+                if tentative_g + other_g[neigh] < self.best:
+                    self.best = tentative_g + other_g[neigh]
+                    self.meet = neigh
+        if len(fwd) + len(bwd) > self.peak_frontier:
+            self.peak_frontier = len(fwd) + len(bwd)
+        return True
+
+    def frontier(self) -> set[int]:
+        return {pos for _, pos in self.open[0]} | {pos for _, pos in self.open[1]}
+
+    def path(self) -> list[tuple[int, int]]:
+        if not self.found:
+            return []
+        out = []
+        current = self.meet
+        while current != -1:
+            out.append(self.city.pos(current))
+            current = self.parents[0][current]
+        out.reverse()
+        current = self.parents[1][self.meet]
+        while current != -1:
+            out.append(self.city.pos(current))
+            current = self.parents[1][current]
+        return out
+
+
+class DStarLite(Search):
+    '''
+    D* Lite: searches backwards from the goal, keeping for every cell g (its distance to
+    the goal as of the last expansion) and rhs (what it should be given its neighbours).
+    Cells where the two disagree are on the open list. When buildings appear or disappear
+    with toggle(), only the cells next to the edit get their rhs recomputed, and stepping
+    again just fixes up the distances that actually changed instead of starting over.
+    The start never moves here, so there's no km offset.
+    '''
+    name = "D* Lite"
+
+    INF = 2**31 - 1
+
+    def __init__(self, city, start, goal):
+        super().__init__(city, start, goal)
+        n = len(city.cells)
+        self.g = array("i", [self.INF]) * n
+        self.rhs = array("i", [self.INF]) * n
+        # The key each cell is currently queued with; heap entries that don't match are stale
+        self.key1 = array("i", [0]) * n
+        self.key2 = array("i", [0]) * n
+        self.in_open = bytearray(n)
+        self.open_queue = []
+        self.rhs[self.goal] = 0
+        self.push(self.goal)
+
+    def calc_key(self, idx: int) -> tuple[int, int]:
+        m = min(self.g[idx], self.rhs[idx])
+        return m + manhattan(self.start, idx, self.city.cols), m
+
+    def push(self, idx: int):
+        k1, k2 = self.calc_key(idx)
+        self.key1[idx], self.key2[idx] = k1, k2
+        self.in_open[idx] = 1
+        heapq.heappush(self.open_queue, (k1, k2, idx))
+
+    def top(self):
+        # Drop stale entries so the head of the heap is a real one (or the heap is empty)
+        heap, in_open, key1, key2 = self.open_queue, self.in_open, self.key1, self.key2
+        while heap:
+            k1, k2, idx = heap[0]
+            if in_open[idx] and key1[idx] == k1 and key2[idx] == k2:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def update_vertex(self, idx: int):
+        cells, g, inf = self.city.cells, self.g, self.INF
+        if idx != self.goal:
+            best = inf
+            if not cells[idx]:
+                for neigh in self.city.neighbors(idx):
+                    if not cells[neigh] and g[neigh] < best:
+                        best = g[neigh]
+                best = best + 1 if best < inf else inf
+            self.rhs[idx] = best
+        self.in_open[idx] = 0
+        if g[idx] != self.rhs[idx]:
+            self.push(idx)
+
+    def step(self) -> bool:
+        if self.done:
+            return False
+        head = self.top()
+        start = self.start
+        if head is None or ((head[0], head[1]) >= self.calc_key(start) and self.rhs[start] == self.g[start]):
+            self.found = self.g[start] < self.INF
+            self.done = True
+            return False
+        heapq.heappop(self.open_queue)
+        current = head[2]
+        self.in_open[current] = 0
+        self.closed[current] = 1
+        self.expanded += 1
+        g, rhs = self.g, self.rhs
+        if g[current] > rhs[current]:
+            g[current] = rhs[current]  # distance went down (or was found for the first time)
+        else:
+            g[current] = self.INF  # distance went up, recompute it and everything relying on it
+            self.update_vertex(current)
+        for neigh in self.city.neighbors(current):
+            self.update_vertex(neigh)
+        if len(self.open_queue) > self.peak_frontier:
+            self.peak_frontier = len(self.open_queue)
+        return True
+
+    def toggle(self, pos: tuple[int, int]):
+        '''
+        Flip one cell between road and building. Call run() (or step()) afterwards to
+        repair the path; expanded keeps counting, so the difference is the replan cost.
+        '''
+        idx = self.city.index(pos)
+        if idx == self.start or idx == self.goal:
+            raise ValueError("can't build on the start or goal")
+        self.city.cells[idx] ^= 1
+        self.update_vertex(idx)
+        for neigh in self.city.neighbors(idx):
+            self.update_vertex(neigh)
+        self.done = self.found = False
+
+    def frontier(self) -> set[int]:
+        return {idx for _, _, idx in self.open_queue if self.in_open[idx]}
+
+    def path(self) -> list[tuple[int, int]]:
+        # Walk downhill in g from the start; ties go to the first neighbour like everywhere else
+        if not self.found:
+            return []
+        cells, g = self.city.cells, self.g
+        current = self.start
+        out = [self.city.pos(current)]
+        while current != self.goal:
+            current = min((n for n in self.city.neighbors(current) if not cells[n]), key=g.__getitem__)
+            out.append(self.city.pos(current))
+        return out
+
+
+ALGORITHMS: dict[str, type[Search]] = {"BFS": BFS, "DFS": DFS, "A*": AStar, "JPS": JPS, "Bi-A*": BidirectionalAStar,
+                                       "D* Lite": DStarLite}
+
+
+@dataclass
+class SearchResult:
+    algorithm: str
+    path: list[tuple[int, int]]
+    expanded: int
+    peak_frontier: int
+    wall_time: float
+
+
+def find_path(city: City, start: tuple[int, int], goal: tuple[int, int], algorithm: str = "A*") -> SearchResult:
+    '''
+    Runs one search to completion with no drawing. wall_time (seconds) includes setting
+    up the per-cell arrays, since that's part of what a big city costs.
+    '''
+    t0 = time.perf_counter()
+    search = ALGORITHMS[algorithm](city, start, goal).run()
+    wall = time.perf_counter() - t0
+    return SearchResult(algorithm, search.path(), search.expanded, search.peak_frontier, wall)
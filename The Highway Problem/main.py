@@ -5,25 +5,31 @@ down a highway to get the most cars through every time interval?
 
 import matplotlib.pyplot as plt
 import math
+import numpy as np
+
+CAR_LENGTH = 4  # m
+
+# Braking distance in metres as a function of speed in km/h. Written with plain
+# arithmetic so they work on a single speed or a whole NumPy array of speeds.
+BRAKING_MODELS = {
+    "dry": lambda v: 0.00577381*v**2 + 0.385119*v + 1.23214, # dry conservative
+    "wet": lambda v: 0.00791667*v**2 + 0.430357*v - 0.0892857, # wet conservative
+    "dangerous": lambda v: 0.0022*v**2 + 0.15*v + 1.5, # dangerous braking speed
+    "2 second": lambda v: (v * 1000 / 3600)*2, # "two second between" rule of thumb
+    "3 second": lambda v: (v * 1000 / 3600)*3, # "three second between" rule of thumb
+    "none": lambda v: 0*v, # no braking distance
+}
 
 class Highway:
-    def __init__(self, speed_limit: int, lanes: int = 4) -> None:
+    def __init__(self, speed_limit: int, lanes: int = 4, braking_model: str = "dry") -> None:
         self.speed_limit = speed_limit  # in km/h
         self.lanes = lanes
         self.speed_m_s = self.speed_limit * 1000 / 3600
-
-
-        self.braking_distance = 0.00577381*self.speed_limit**2 + 0.385119*self.speed_limit + 1.23214 # dry conservative
-        # self.braking_distance = 0.00791667*self.speed_limit**2 + 0.430357*self.speed_limit - 0.0892857 # wet conservative
-        # self.braking_distance = 0.0022*self.speed_limit**2 + 0.15*self.speed_limit + 1.5 # dangerous braking speed
-        # self.braking_distance = self.speed_m_s*2 # "two second between" rule of thumb
-        # braking_distance = speed_m_s*3 # "three second between" rule of thumb
-        # self.braking_distance = 0 # no braking distance
+        self.braking_distance = BRAKING_MODELS[braking_model](self.speed_limit)
 
     def calculate_max_cars(self, time_period_h: float = 1.0) -> int:
 
-        car_length = 4
-        total_gap = self.braking_distance + car_length  
+        total_gap = self.braking_distance + CAR_LENGTH
         cars_per_second_per_lane = self.speed_m_s / total_gap
 
         # Total cars over time period across all lanes
@@ -44,9 +50,39 @@ class Highway:
         return self.braking_distance
 
 
-    
+def safety_rating(speed_limit):
+    # Same logistic fit as Highway.get_safety_rating, but works on arrays
+    return 100.8366 / (1 + np.exp(-1 * (0.0619719 * speed_limit - 5.21318)))
+
+
+def evaluate_grid(speeds: np.ndarray, lanes: np.ndarray, models: list[str] = list(BRAKING_MODELS),
+                  time_period_h: float = 1.0) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Highway.calculate_max_cars and get_safety_rating for every (model, lanes, speed)
+    combination at once. Returns (cars, risk): cars has shape (len(models), len(lanes),
+    len(speeds)) and risk has shape (len(speeds),) since it only depends on speed.
+    '''
+    speeds = np.asarray(speeds, dtype=float)
+    lanes = np.asarray(lanes, dtype=float)
+    speed_m_s = speeds * 1000 / 3600
+    braking = np.stack([BRAKING_MODELS[m](speeds) for m in models])         # (models, speeds)
+    cars_per_lane = speed_m_s / (braking + CAR_LENGTH) * time_period_h * 3600  # (models, speeds)
+    cars = np.rint(cars_per_lane[:, None, :] * lanes[None, :, None])          # (models, lanes, speeds)
+    return cars, safety_rating(speeds)
+
+
+def pareto_front(throughput: np.ndarray, risk: np.ndarray) -> np.ndarray:
+    '''
+    Indices of the points nobody beats on both counts (more throughput AND less risk),
+    ordered from safest to riskiest. Sort by risk, then a point is on the front only if
+    it carries more cars than everything safer than it.
+    '''
+    order = np.lexsort((-throughput, risk))
+    t = throughput[order]
+    best_before = np.maximum.accumulate(np.concatenate(([-np.inf], t[:-1])))
+    return order[t > best_before]
+
 
- 
 if __name__ == "__main__":
     speeds = [v for v in range(10, 501, 10)]
     cars: list[int] = []
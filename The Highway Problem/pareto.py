@@ -0,0 +1,51 @@
+'''
+Speed vs safety trade-off over a dense grid of speeds, lane counts and braking models.
+A setting is on the Pareto front if no other setting gets more cars through per hour
+while also having a lower fatality risk.
+'''
+
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+from main import BRAKING_MODELS, evaluate_grid, pareto_front
+
+SPEEDS = np.linspace(10, 500, 250_001)   # km/h
+LANES = np.arange(1, 9)
+MODELS = list(BRAKING_MODELS)
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    cars, risk = evaluate_grid(SPEEDS, LANES, MODELS)
+    t_eval = time.perf_counter() - start
+
+    # Risk only depends on speed, so the best (model, lanes) at each speed is the only
+    # candidate for the front there. That shrinks the sort to one entry per speed.
+    start = time.perf_counter()
+    flat = cars.reshape(-1, len(SPEEDS))
+    best = flat.argmax(axis=0)
+    best_cars = flat[best, np.arange(len(SPEEDS))]
+    front = pareto_front(best_cars, risk)
+    t_front = time.perf_counter() - start
+
+    print(f"{cars.size:,} grid points evaluated in {t_eval * 1000:.0f} ms, front found in {t_front * 1000:.0f} ms")
+    print(f"Overall front: {len(front)} points, "
+          f"{SPEEDS[front[0]]:.1f} km/h ({best_cars[front[0]]:.0f} cars/h, {risk[front[0]]:.2f}% risk) to "
+          f"{SPEEDS[front[-1]]:.1f} km/h ({best_cars[front[-1]]:.0f} cars/h, {risk[front[-1]]:.2f}% risk)")
+
+    # One front per braking model at the default 4 lanes, since comparing models is the interesting bit
+    four = list(LANES).index(4)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for m, model in enumerate(MODELS):
+        c = cars[m, four]
+        idx = pareto_front(c, risk)
+        ax.plot(risk[idx], c[idx], linewidth=2, label=f"{model} (front tops out at {SPEEDS[idx[-1]]:.0f} km/h)")
+        print(f"{model:>10}: max {c[idx[-1]]:.0f} cars/h at {SPEEDS[idx[-1]]:.1f} km/h, risk {risk[idx[-1]]:.2f}%")
+
+    ax.set_xlabel('Fatality Risk (%)', fontsize=12)
+    ax.set_ylabel('Max Cars per Hour (4 lanes)', fontsize=12)
+    ax.set_yscale('log')
+    ax.grid(True, which='both', linestyle='--', linewidth=0.5)
+    ax.legend()
+    plt.title("Pareto front: throughput vs fatality risk", fontsize=14)
+    fig.tight_layout()
+    plt.show()
@@ -1,16 +1,36 @@
 '''
-BROKEN AT THE MOMENT
+Slider-driven traffic simulation. Each lane is a queue of cars in driving order
+(front car first), so the car ahead of any car is just the one before it in its lane.
+Cars never change lanes or overtake, so that order only changes when a car spawns at
+the back or leaves at the front, and each frame is one pass over the cars.
 '''
 
 
 import pygame
 import pygame_gui
 import random
-import time
+from collections import deque
+
+WIDTH, HEIGHT = 1000, 600
+ROAD_TOP = 270             # px, leaves room for the sliders above the road
+ROAD_LENGTH = 800          # units (1 unit = 1 px)
+MIN_SPAWN_GAP = 10         # units of free road needed behind the last car in a lane
+MAX_DT = 0.1               # s, cap so a stalled frame doesn't teleport everyone
+THROUGHPUT_WINDOW_S = 60
+
+COLORS = {
+    'car': (0, 120, 250),
+    'truck': (200, 50, 50),
+    'bike': (50, 200, 50)
+}
+CLOSED_LANE_COLOR = (70, 40, 40)
+
 
 # Vehicle definitions
 class Car:
-    def __init__(self, lane, vehicle_type, speed_limit, braking_distance):
+    __slots__ = ("lane", "type", "desired_speed", "speed", "braking_distance", "length", "x")
+
+    def __init__(self, lane, vehicle_type, speed_limit, braking_distance, length):
         self.lane = lane
         self.type = vehicle_type
         base_speeds = {
@@ -21,62 +41,140 @@ class Car:
         self.desired_speed = base_speeds.get(vehicle_type, speed_limit)
         self.speed = self.desired_speed * random.uniform(0.7, 1.0)
         self.braking_distance = braking_distance * random.uniform(0.8, 1.2)
-        self.width = 0
-        self.length = 0
-        self.x = 0
-
-    def update(self, dt, speed_limit, cars_in_lane):
-        # look for the car right ahead in this lane
-        ahead = [c for c in cars_in_lane if c.x > self.x]
-        if ahead:
-            gap = min(c.x - self.x for c in ahead)
+        self.length = length
+        self.x = 0.0  # back of the car
+
+    def update(self, dt, speed_limit, ahead):
+        # `ahead` is the car right in front in this lane (or None)
+        target = min(self.desired_speed, speed_limit)
+        if ahead is not None:
+            gap = ahead.x - (self.x + self.length)
             if gap < self.braking_distance:
                 # brake
                 self.speed = max(0, self.speed - 5 * dt)
             else:
                 # go to desired/speed limit
-                self.speed = min(self.desired_speed, speed_limit)
+                self.speed = target
+            # never drive into the car ahead, which also keeps the lane order fixed; a car
+            # held up behind it is only doing the leader's speed
+            self.x += self.speed * dt
+            if self.x > ahead.x - self.length:
+                self.x = ahead.x - self.length
+                self.speed = ahead.speed
         else:
-            self.speed = min(self.desired_speed, speed_limit)
-        self.x += self.speed * dt
+            self.speed = target
+            self.x += self.speed * dt
+
+
+class ThroughputCounter:
+    '''
+    Vehicles per window (e.g. per minute) from a ring of fixed-size time buckets, so
+    memory stays the same however long the simulation runs.
+    '''
+    def __init__(self, window_s: float = THROUGHPUT_WINDOW_S, bucket_s: float = 1.0):
+        self.bucket_s = bucket_s
+        self.buckets = [0] * int(window_s / bucket_s)
+        self.total = 0
+        self.current = 0  # index (in bucket_s units since start) of the newest bucket
+
+    def advance(self, t: float):
+        # Zero out any buckets we've moved past since the last call
+        now = int(t / self.bucket_s)
+        n = len(self.buckets)
+        for b in range(self.current + 1, min(now, self.current + n) + 1):
+            self.total -= self.buckets[b % n]
+            self.buckets[b % n] = 0
+        self.current = max(self.current, now)
+
+    def add(self, t: float, count: int = 1):
+        self.advance(t)
+        self.buckets[self.current % len(self.buckets)] += count
+        self.total += count
+
 
 class Highway:
     def __init__(self, num_lanes, lane_width, length):
-        self.num_lanes = num_lanes
         self.lane_width = lane_width
         self.length = length
-        self.cars = []
+        self.lanes: list[deque[Car]] = [deque() for _ in range(num_lanes)]
+        self.open_lanes = num_lanes  # lanes >= this are closed: no new cars, they just drain
+        self.num_cars = 0
+        self.time = 0.0
+        self.throughput = ThroughputCounter()
+        self.speed_sum = 0.0
+
+    def set_num_lanes(self, n):
+        # Adding lanes appends empty ones; removing lanes closes them so the cars already
+        # on them still finish their trip instead of vanishing
+        while len(self.lanes) < n:
+            self.lanes.append(deque())
+        self.open_lanes = n
+        self.drop_empty_closed_lanes()
+
+    def drop_empty_closed_lanes(self):
+        while len(self.lanes) > self.open_lanes and not self.lanes[-1]:
+            self.lanes.pop()
+
+    def try_spawn(self, vehicle_type, speed_limit, braking_distance):
+        lane_idx = random.randrange(self.open_lanes)
+        lane = self.lanes[lane_idx]
+        length = self.lane_width * 0.4
+        # only spawn if the back of the lane has room
+        if lane and lane[-1].x < length + MIN_SPAWN_GAP:
+            return
+        lane.append(Car(lane_idx, vehicle_type, speed_limit, braking_distance, length))
+        self.num_cars += 1
 
     def update(self, dt, speed_limit):
-        for lane_idx in range(self.num_lanes):
-            lane_cars = [c for c in self.cars if c.lane == lane_idx]
-            for car in lane_cars:
-                car.update(dt, speed_limit, lane_cars)
+        self.time += dt
+        speed_sum = 0.0
+        for lane in self.lanes:
+            ahead = None
+            for car in lane:
+                car.update(dt, speed_limit, ahead)
+                speed_sum += car.speed
+                ahead = car
+            # cars only ever leave from the front, and the ones that left don't count
+            # towards the average speed
+            while lane and lane[0].x >= self.length:
+                speed_sum -= lane.popleft().speed
+                self.num_cars -= 1
+                self.throughput.add(self.time)
+        self.throughput.advance(self.time)
+        self.speed_sum = speed_sum
+        self.drop_empty_closed_lanes()
+
+    def avg_speed(self):
+        return self.speed_sum / max(self.num_cars, 1)
+
+    def lane_px(self):
+        # squeeze lanes to fit if the sliders ask for more road than the window has
+        return min(self.lane_width, (HEIGHT - ROAD_TOP) / max(len(self.lanes), 1))
 
     def draw(self, surface):
+        lane_px = self.lane_px()
+        # closed lanes get a tint while they drain
+        for i in range(self.open_lanes, len(self.lanes)):
+            pygame.draw.rect(surface, CLOSED_LANE_COLOR, (0, ROAD_TOP + i * lane_px, self.length, lane_px))
         # draw road and lanes
-        for i in range(self.num_lanes + 1):
-            y = i * self.lane_width
+        for i in range(len(self.lanes) + 1):
+            y = ROAD_TOP + i * lane_px
             pygame.draw.line(surface, (200, 200, 200), (0, y), (self.length, y), 2)
         # draw each vehicle
-        for car in self.cars:
-            rx = int(car.x)
-            ry = int(car.lane * self.lane_width + (self.lane_width - car.width) / 2)
-            color = {
-                'car': (0, 120, 250),
-                'truck': (200, 50, 50),
-                'bike': (50, 200, 50)
-            }[car.type]
-            rect = pygame.Rect(rx, ry, car.length, car.width)
-            pygame.draw.rect(surface, color, rect)
+        car_w = lane_px * 0.6
+        for i, lane in enumerate(self.lanes):
+            ry = int(ROAD_TOP + i * lane_px + (lane_px - car_w) / 2)
+            for car in lane:
+                pygame.draw.rect(surface, COLORS[car.type], (int(car.x), ry, car.length, car_w))
+
 
 def main():
     pygame.init()
-    WIDTH, HEIGHT = 1000, 600
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Traffic Simulation")
     manager = pygame_gui.UIManager((WIDTH, HEIGHT))
     clock = pygame.time.Clock()
+    font = pygame.font.SysFont(None, 24)
 
     # default params
     speed_limit = 100.0        # units/sec
@@ -99,23 +197,22 @@ def main():
     for idx, (name, mn, mx, val) in enumerate(params):
         y = 10 + idx * 50
         labels[name] = pygame_gui.elements.UILabel(
-            pygame.Rect( (10, y), (140, 30) ),
+            pygame.Rect( (10, y), (160, 30) ),
             text=f"{name}: {val}",
             manager=manager
         )
         sliders[name] = pygame_gui.elements.UIHorizontalSlider(
-            pygame.Rect((160, y), (200, 30)),
+            pygame.Rect((180, y), (200, 30)),
             start_value=val,
             value_range=(mn, mx),
             manager=manager
         )
 
-    highway = Highway(num_lanes, lane_width, length=800)
-    exit_times = []
+    highway = Highway(num_lanes, lane_width, length=ROAD_LENGTH)
 
     running = True
     while running:
-        dt = clock.tick(60) / 1000.0
+        dt = min(clock.tick(60) / 1000.0, MAX_DT)
         for event in pygame.event.get():
             manager.process_events(event)
             if event.type == pygame.QUIT:
@@ -133,54 +230,29 @@ def main():
                             braking_distance = v
                         elif name == "Lane Width":
                             lane_width = v
+                            highway.lane_width = v
                         elif name == "# Lanes":
                             num_lanes = v
-                            highway = Highway(num_lanes, lane_width, length=800)
-                            exit_times.clear()
+                            highway.set_num_lanes(num_lanes)
 
         manager.update(dt)
 
         # spawn new vehicles
         if random.random() < (spawn_rate / 60.0) * dt:
-            lane = random.randrange(num_lanes)
-            r = random.random()
-            cum = 0
-            for vt, prob in spawn_probs.items():
-                cum += prob
-                if r < cum:
-                    vehicle_type = vt
-                    break
-            car = Car(lane, vehicle_type, speed_limit, braking_distance)
-            car.width = lane_width * 0.6
-            car.length = lane_width * 0.4
-            highway.cars.append(car)
+            vehicle_type = random.choices(list(spawn_probs), weights=list(spawn_probs.values()))[0]
+            highway.try_spawn(vehicle_type, speed_limit, braking_distance)
 
         highway.update(dt, speed_limit)
 
-        # remove cars past the end
-        now = time.time()
-        remaining = []
-        for c in highway.cars:
-            if c.x < highway.length:
-                remaining.append(c)
-            else:
-                exit_times.append(now)
-        highway.cars = remaining
-
-        # compute stats
-        cpm = sum(1 for t in exit_times if now - t <= 60)
-        avg_speed = sum(c.speed for c in highway.cars) / max(len(highway.cars), 1)
-
         # draw
         screen.fill((30, 30, 30))
         highway.draw(screen)
 
         # overlay metrics
-        font = pygame.font.SysFont(None, 24)
         for i, txt in enumerate([
-            f"Throughput: {cpm} veh/min",
-            f"Active Vehicles: {len(highway.cars)}",
-            f"Avg Speed: {avg_speed:.1f}"
+            f"Throughput: {highway.throughput.total} veh/min",
+            f"Active Vehicles: {highway.num_cars}",
+            f"Avg Speed: {highway.avg_speed():.1f}"
         ]):
             surf = font.render(txt, True, (255,255,255))
             screen.blit(surf, (400, 10 + i*25))
@@ -191,4 +263,4 @@ def main():
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,171 @@
+import csv
+import time
+import numpy as np
+from main import Highway, ArrayHighway, DT, CAR_LENGTH_M, LANES
+
+# Fast-forward runner: no window, no FPS cap. Steps a highway for a given amount of sim
+# time and records virtual loop-detector data, streaming it to CSV or Parquet in chunks
+# so hour-long runs don't pile up in memory.
+
+DURATION_S = 2 * 3600
+DETECTORS_M = [1_000, 3_000, 5_000, 7_000, 9_000]
+INTERVAL_S = 60.0           # aggregation period for each detector row
+SPAWN_RATES = [0.2, 0.4, 0.6, 0.8, 1.0, 1.5, 2.0, 3.0, 4.0, 5.0]
+OUTPUT = "detectors.csv"    # ".parquet" also works
+CHUNK_ROWS = 1_000          # rows buffered before each write
+USE_ARRAYS = True           # ArrayHighway is much faster than Highway for long runs
+LOOP_LENGTH_M = 2.0         # physical length of the loop, used for occupancy
+
+COLUMNS = ["spawn_rate", "lanes", "detector_m", "t_start", "t_end", "count",
+           "flow_veh_h", "mean_speed", "harmonic_speed", "occupancy", "density_veh_km"]
+
+
+class LoopDetector:
+    '''
+    Counts cars crossing position `pos` (all lanes) and accumulates what a real
+    inductive loop would give you over an interval: vehicle count, spot speeds and
+    how long the loop was covered by a car.
+    '''
+    def __init__(self, pos: float):
+        self.pos = pos
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.speed_sum = 0.0
+        self.inv_speed_sum = 0.0
+        self.occupied_s = 0.0
+
+    def observe(self, x_before: np.ndarray, x_after: np.ndarray, v: np.ndarray):
+        crossed = (x_before < self.pos) & (x_after >= self.pos)
+        if not crossed.any():
+            return
+        speeds = v[crossed]
+        self.count += len(speeds)
+        self.speed_sum += float(speeds.sum())
+        self.inv_speed_sum += float((1.0 / speeds).sum())
+        # A car covers the loop while it drives its own length plus the loop's
+        self.occupied_s += float(((CAR_LENGTH_M + LOOP_LENGTH_M) / speeds).sum())
+
+    def flush(self, interval_s: float) -> dict:
+        flow = self.count / interval_s * 3600
+        mean_speed = self.speed_sum / self.count if self.count else float("nan")
+        # Space-mean speed (harmonic mean of spot speeds) is the one that gives density = flow / speed
+        harmonic = self.count / self.inv_speed_sum if self.count else float("nan")
+        row = {
+            "count": self.count,
+            "flow_veh_h": flow,
+            "mean_speed": mean_speed,
+            "harmonic_speed": harmonic,
+            "occupancy": min(1.0, self.occupied_s / interval_s),
+            "density_veh_km": flow / (harmonic * 3.6) if self.count else 0.0,
+        }
+        self.reset()
+        return row
+
+
+class ChunkWriter:
+    '''
+    Appends rows to a CSV or Parquet file (picked by extension) CHUNK_ROWS at a time.
+    '''
+    def __init__(self, path: str, columns: list[str], chunk_rows: int = CHUNK_ROWS):
+        self.path = path
+        self.columns = columns
+        self.chunk_rows = chunk_rows
+        self.buffer: list[dict] = []
+        self.parquet = path.endswith(".parquet")
+        if self.parquet:
+            import pyarrow.parquet as pq
+            self._pq = pq
+            self._writer = None
+        else:
+            self._file = open(path, "w", newline="")
+            self._writer = csv.DictWriter(self._file, fieldnames=columns)
+            self._writer.writeheader()
+
+    def write(self, row: dict):
+        self.buffer.append(row)
+        if len(self.buffer) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        if self.parquet:
+            import pyarrow as pa
+            table = pa.Table.from_pylist(self.buffer).select(self.columns)
+            if self._writer is None:
+                self._writer = self._pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            self._writer.writerows(self.buffer)
+            self._file.flush()
+        self.buffer.clear()
+
+    def close(self):
+        self.flush()
+        if self.parquet:
+            if self._writer is not None:
+                self._writer.close()
+        else:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run(world, duration_s: float, detector_positions: list[float], interval_s: float,
+        writer: ChunkWriter, extra: dict | None = None):
+    '''
+    Advances `world` (Highway or ArrayHighway) by duration_s of sim time, writing one row
+    per detector per interval. `extra` columns (e.g. spawn_rate) are added to every row.
+    '''
+    detectors = [LoopDetector(p) for p in detector_positions]
+    world.detectors = detectors
+    steps_per_interval = max(1, round(interval_s / DT))
+    n_steps = round(duration_s / DT)
+    t_start = world.time
+    for step in range(1, n_steps + 1):
+        world.step()
+        if step % steps_per_interval == 0:
+            for det in detectors:
+                row = {"detector_m": det.pos, "t_start": round(t_start, 3), "t_end": round(world.time, 3)}
+                row.update(det.flush(world.time - t_start))
+                if extra:
+                    row.update(extra)
+                writer.write(row)
+            t_start = world.time
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    with ChunkWriter(OUTPUT, COLUMNS) as writer:
+        for rate in SPAWN_RATES:
+            if USE_ARRAYS:
+                world = ArrayHighway(spawn_rate=rate, seed=0)
+            else:
+                world = Highway()
+                world.spawn_rate = rate
+            t0 = time.perf_counter()
+            run(world, DURATION_S, DETECTORS_M, INTERVAL_S, writer, {"spawn_rate": rate, "lanes": LANES})
+            print(f"spawn_rate={rate:.2f}: {DURATION_S / 3600:.1f}h of sim in {time.perf_counter() - t0:.1f}s")
+    print(f"Wrote {OUTPUT} in {time.perf_counter() - start:.1f}s")
+
+    # Quick fundamental diagram from what we just wrote
+    import matplotlib.pyplot as plt
+    if OUTPUT.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        data = pq.read_table(OUTPUT).to_pydict()
+    else:
+        with open(OUTPUT) as f:
+            rows = list(csv.DictReader(f))
+        data = {c: [float(r[c]) for r in rows] for c in ("density_veh_km", "flow_veh_h", "spawn_rate")}
+    plt.scatter(data["density_veh_km"], data["flow_veh_h"], c=data["spawn_rate"], s=6, cmap="viridis") # type: ignore
+    plt.colorbar(label="spawn rate (cars/s)") # type: ignore
+    plt.xlabel("Density (veh/km, all lanes)") # type: ignore
+    plt.ylabel("Flow (veh/h, all lanes)") # type: ignore
+    plt.title("Fundamental diagram from loop detectors") # type: ignore
+    plt.show() # type: ignore
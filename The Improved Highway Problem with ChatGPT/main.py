@@ -1,7 +1,10 @@
 import pygame
 import random
+import numpy as np
 import math
+from bisect import bisect_left, bisect_right, insort
 from collections import deque
+from operator import attrgetter
 
 # -----------------------------
 # Config
@@ -20,6 +23,7 @@ SCREEN_H = LANE_HEIGHT_PX * LANES + 2 * MARGIN_PX
 
 FPS = 60
 DT = 0.2  # seconds per sim step (simulation updates every frame)
+USE_ARRAYS = False  # True -> ArrayHighway (NumPy, vectorised step) instead of Highway
 
 # Spawning
 INITIAL_SPAWN_RATE = 0.6  # cars per second; bump to see congestion emerge
@@ -70,15 +74,22 @@ class Car:
         return pygame.Rect(x_px - w // 2, y_top, w, h)
 
 
+car_x = attrgetter("x")
+
+
 class Highway:
     def __init__(self):
         self.cars: list[Car] = []
+        # Per-lane lists of the same cars, kept sorted by x (back of the road first),
+        # so leader/follower lookups are a bisect instead of a scan over every car
+        self.lanes: list[list[Car]] = [[] for _ in range(LANES)]
         self.spawn_accumulator = 0.0
         self.spawn_rate = INITIAL_SPAWN_RATE  # cars/sec
         self.paused = False
         self.show_velocity_colors = True
         self.time = 0.0
         self.spawn_id = 0
+        self.detectors = []  # loop detectors (see headless.py), fed every move before removals
 
     # --------- Spawning / Removal ----------
     def spawn_car(self):
@@ -92,52 +103,55 @@ class Highway:
         exit_pos = random.choice(EXITS_M)
         c = Car(v0=v0, lane=lane, exit_pos=exit_pos)
 
-        # Try to avoid immediate collisions at spawn: ensure a gap in chosen lane
-        lane_cars = [car for car in self.cars if car.lane == lane and car.x < 120.0]
-        if lane_cars:
-            nearest = min((120.0 - car.x) for car in lane_cars)
-            if nearest < (CAR_LENGTH_M + 2.0):
-                return  # skip this tick; no room
+        # Try to avoid immediate collisions at spawn: ensure a gap in chosen lane.
+        # The rearmost car in the lane is the first one in its sorted list.
+        lane_cars = self.lanes[lane]
+        if lane_cars and lane_cars[0].x < (CAR_LENGTH_M + 2.0):
+            return  # skip this tick; no room
 
         self.cars.append(c)
+        insort(lane_cars, c, key=car_x)
         self.spawn_id += 1
 
     def remove_exited_or_finished(self):
         # Remove cars that took their exit (must be in rightmost lane) or reached end
-        survivors = []
-        for c in self.cars:
+        def still_driving(c: Car) -> bool:
             took_exit = (c.lane == LANES - 1) and (c.x >= c.exit_pos)
             reached_end = c.x >= HIGHWAY_LENGTH_M
-            if not (took_exit or reached_end):
-                survivors.append(c)
-        self.cars = survivors
+            return not (took_exit or reached_end)
+
+        self.cars = [c for c in self.cars if still_driving(c)]
+        self.lanes = [[c for c in lane_cars if still_driving(c)] for lane_cars in self.lanes]
 
     # --------- Neighborhood Queries ----------
     def get_front_car(self, lane, x):
         # Return front car in the same lane ahead of position x (smallest positive headway)
-        front = None
-        best_d = 1e9
-        for c in self.cars:
-            if c.lane == lane and c.x > x:
-                d = c.x - x
-                if d < best_d:
-                    best_d = d
-                    front = c
-        return front, best_d
+        lane_cars = self.lanes[lane]
+        i = bisect_right(lane_cars, x, key=car_x)
+        if i == len(lane_cars):
+            return None, 1e9
+        front = lane_cars[i]
+        return front, (front.x - x)
 
     def get_back_car(self, lane, x):
-        # Car behind (largest negative headway)
-        back = None
-        best_d = -1e9
-        for c in self.cars:
-            if c.lane == lane and c.x < x:
-                d = x - c.x
-                if d < (x - (back.x if back else -1e9)):
-                    back = c
-        if back is None:
+        # Car behind (smallest negative headway)
+        lane_cars = self.lanes[lane]
+        i = bisect_left(lane_cars, x, key=car_x)
+        if i == 0:
             return None, 1e9
+        back = lane_cars[i - 1]
         return back, (x - back.x)
 
+    def move_to_lane(self, c: Car, lane2: int):
+        # Take c out of its current lane list (bisect to its x, then find it among any ties)
+        lane_cars = self.lanes[c.lane]
+        i = bisect_left(lane_cars, c.x, key=car_x)
+        while lane_cars[i] is not c:
+            i += 1
+        del lane_cars[i]
+        c.lane = lane2
+        insort(self.lanes[lane2], c, key=car_x)
+
     # --------- Dynamics ----------
     def desired_accel(self, c: Car):
         # Very simple car-following: try to reach desired speed; brake if front-gap too small
@@ -204,7 +218,7 @@ class Highway:
         need_behind = max(LANE_CHANGE_LOOK_BACK, (b2.v if b2 else 0.0) * 0.5)
 
         if gap_ahead >= need_ahead and gap_behind >= need_behind:
-            c.lane = lane2
+            self.move_to_lane(c, lane2)
             c.time_since_lane_change = 0.0
 
     def step(self):
@@ -225,10 +239,23 @@ class Highway:
             # Lane change decision before speed update (greedy)
             self.lane_change_decision(c)
 
+        # Work out every car's acceleration from the current positions first, then move
+        # everyone, so the per-lane order stays valid for all the lookups in this step
         for c in self.cars:
             c.a = self.desired_accel(c)
+        prev_x = np.array([c.x for c in self.cars]) if self.detectors else None
+        for c in self.cars:
             c.v = max(MIN_SPEED * 0.25, min(MAX_SPEED, c.v + c.a * DT))
             c.x += c.v * DT
+        if self.detectors:
+            x = np.array([c.x for c in self.cars])
+            v = np.array([c.v for c in self.cars])
+            for det in self.detectors:
+                det.observe(prev_x, x, v)
+
+        # Cars barely change order in one step, so this is close to linear (timsort)
+        for lane_cars in self.lanes:
+            lane_cars.sort(key=car_x)
 
         # Remove cars that have exited or reached the end
         self.remove_exited_or_finished()
@@ -236,25 +263,7 @@ class Highway:
 
     # --------- Rendering ----------
     def draw(self, surf: pygame.Surface, font):
-        surf.fill(BG)
-
-        # Lanes
-        for i in range(LANES):
-            y = MARGIN_PX + i * LANE_HEIGHT_PX
-            pygame.draw.rect(surf, LANE_COLOR, (MARGIN_PX, y, SCREEN_W - 2 * MARGIN_PX, LANE_HEIGHT_PX), border_radius=10)
-
-        # Exits (draw dashed vertical markers, and a "merge" triangle into rightmost lane)
-        for ex in EXITS_M:
-            x_px = MARGIN_PX + int(ex * PX_PER_M)
-            pygame.draw.line(surf, EXIT_COLOR, (x_px, MARGIN_PX), (x_px, SCREEN_H - MARGIN_PX), 2)
-            # shaded merge region for last 1 km before exit on rightmost lane
-            x0 = MARGIN_PX + int(max(0, (ex - EXIT_MERGE_START)) * PX_PER_M)
-            y_top = MARGIN_PX + (LANES - 1) * LANE_HEIGHT_PX
-            pygame.draw.polygon(surf, (30, 30, 35),
-                                [(x0, y_top),
-                                 (x_px, y_top),
-                                 (x_px, y_top + LANE_HEIGHT_PX)],
-                                0)
+        draw_road(surf)
 
         # Cars
         for c in self.cars:
@@ -274,21 +283,288 @@ class Highway:
             if c.will_exit_here and c.lane != (LANES - 1):
                 pygame.draw.rect(surf, (230, 230, 60), (r.right - 4, r.centery - 4, 4, 8))
 
-        # HUD
-        hud_lines = [
-            f"t = {self.time:6.1f}s",
-            f"cars = {len(self.cars)}",
-            f"spawn = {self.spawn_rate:.2f} cars/s  ([ / ] to change)",
-            "P pause | R reset | V velocity colors | ESC quit",
-        ]
-        y = 6
-        for line in hud_lines:
-            txt = font.render(line, True, TEXT)
-            surf.blit(txt, (8, y))
-            y += txt.get_height() + 2
+        draw_hud(surf, font, self.time, len(self.cars), self.spawn_rate)
+
+
+# Sort key spacing for ArrayHighway: key = lane * LANE_KEY + x keeps every lane's
+# cars in their own contiguous, x-sorted block of one sorted array
+LANE_KEY = 2.0 * HIGHWAY_LENGTH_M
+
+
+class ArrayHighway:
+    '''
+    Array-backed version of Highway. Every car attribute is a NumPy array (x[i], v[i], ...
+    is car i) and the per-lane ordering comes from one argsort of lane * LANE_KEY + x, so
+    "who is in front of me" for every car is a single searchsorted. The car-following law
+    from desired_accel and the kinematic update run on the whole array at once.
+
+    Lane changes follow lane_change_decision, but every car decides from the same snapshot;
+    if two cars pick overlapping spots in the same target lane, the front one wins.
+    '''
+    def __init__(self, lanes: int = LANES, spawn_rate: float = INITIAL_SPAWN_RATE,
+                 safe_time_headway: float = SAFE_TIME_HEADWAY,
+                 seed: int | np.random.SeedSequence | None = None):
+        self.n_lanes = lanes
+        self.spawn_rate = spawn_rate
+        self.safe_time_headway = safe_time_headway
+        self.rng = np.random.default_rng(seed)
+        self.spawn_accumulator = 0.0
+        self.paused = False
+        self.show_velocity_colors = True
+        self.time = 0.0
+        self.spawn_id = 0
+        self.detectors = []  # loop detectors (see headless.py), fed every move before removals
+        self.record_trips = False  # if True, keep (spawn time, travel time, distance) of every car that leaves
+        self.trips: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+
+        self.x = np.zeros(0)
+        self.v = np.zeros(0)
+        self.a = np.zeros(0)
+        self.lane = np.zeros(0, dtype=np.int64)
+        self.desired_speed = np.zeros(0)
+        self.exit_pos = np.zeros(0)
+        self.time_since_lane_change = np.zeros(0)
+        self.spawn_time = np.zeros(0)
+
+    def __len__(self):
+        return len(self.x)
+
+    # --------- Spawning / Removal ----------
+    def spawn_cars(self, count: int):
+        rng = self.rng
+        new = []  # (v0, lane, exit_pos)
+        for _ in range(count):
+            # Same draws as Highway.spawn_car: 15% trucks, everyone else around the default speed
+            if rng.random() < 0.15:
+                v0 = rng.uniform(20.0, 27.0)
+            else:
+                v0 = max(MIN_SPEED, min(rng.normal(DEFAULT_DESIRED_SPEED, 4.0), MAX_SPEED))
+            lane = int(rng.integers(self.n_lanes))
+            exit_pos = EXITS_M[rng.integers(len(EXITS_M))]
+
+            # Need room behind the rearmost car in the lane (including anyone spawned just now)
+            in_lane = self.x[self.lane == lane]
+            if any(l == lane for _, l, _ in new) or (len(in_lane) and in_lane.min() < (CAR_LENGTH_M + 2.0)):
+                continue
+            new.append((v0, lane, exit_pos))
+
+        if not new:
+            return
+        v0, lane, exit_pos = (np.array(col) for col in zip(*new))
+        k = len(new)
+        self.x = np.concatenate([self.x, np.zeros(k)])
+        self.v = np.concatenate([self.v, np.clip(v0, MIN_SPEED, MAX_SPEED)])
+        self.a = np.concatenate([self.a, np.zeros(k)])
+        self.lane = np.concatenate([self.lane, lane.astype(np.int64)])
+        self.desired_speed = np.concatenate([self.desired_speed, v0])
+        self.exit_pos = np.concatenate([self.exit_pos, exit_pos.astype(float)])
+        self.time_since_lane_change = np.concatenate([self.time_since_lane_change, np.full(k, LANE_CHANGE_COOLDOWN)])
+        self.spawn_time = np.concatenate([self.spawn_time, np.full(k, self.time)])
+        self.spawn_id += k
+
+    def remove_exited_or_finished(self):
+        took_exit = (self.lane == self.n_lanes - 1) & (self.x >= self.exit_pos)
+        reached_end = self.x >= HIGHWAY_LENGTH_M
+        keep = ~(took_exit | reached_end)
+        if keep.all():
+            return
+        if self.record_trips:
+            gone = ~keep
+            # Removal happens at the end of the step, so they left at time + DT
+            self.trips.append((self.spawn_time[gone], self.time + DT - self.spawn_time[gone], self.x[gone]))
+        self.x = self.x[keep]
+        self.v = self.v[keep]
+        self.a = self.a[keep]
+        self.lane = self.lane[keep]
+        self.desired_speed = self.desired_speed[keep]
+        self.exit_pos = self.exit_pos[keep]
+        self.time_since_lane_change = self.time_since_lane_change[keep]
+        self.spawn_time = self.spawn_time[keep]
+
+    # --------- Neighborhood Queries ----------
+    def sorted_index(self):
+        key = self.lane * LANE_KEY + self.x
+        order = np.argsort(key, kind="stable")
+        return key[order], order
+
+    def leaders(self, index):
+        # Car ahead of every car in its own lane: just the next entry in sorted order,
+        # as long as that entry is still in the same lane
+        keys, order = index
+        n = len(keys)
+        has_front = np.zeros(n, dtype=bool)
+        leader = np.zeros(n, dtype=np.int64)
+        has_front[order[:-1]] = keys[1:] < (self.lane[order[:-1]] + 1) * LANE_KEY
+        leader[order[:-1]] = order[1:]
+        return has_front, leader, np.where(has_front, self.x[leader] - self.x, 1e9)
+
+    def front_of(self, index, lane, x):
+        # For each query (lane[i], x[i]): index of the car ahead in that lane, and the gap
+        keys, order = index
+        n = len(keys)
+        j = np.searchsorted(keys, lane * LANE_KEY + x, side="right")
+        jc = np.minimum(j, max(n - 1, 0))
+        found = (j < n) & (keys[jc] < (lane + 1) * LANE_KEY)
+        idx = order[jc]
+        return found, idx, np.where(found, self.x[idx] - x, 1e9)
+
+    def back_of(self, index, lane, x):
+        keys, order = index
+        j = np.searchsorted(keys, lane * LANE_KEY + x, side="left") - 1
+        jc = np.maximum(j, 0)
+        found = (j >= 0) & (keys[jc] >= lane * LANE_KEY)
+        idx = order[jc]
+        return found, idx, np.where(found, x - self.x[idx], 1e9)
+
+    # --------- Dynamics ----------
+    def lane_change_decisions(self, index):
+        x, v, lane = self.x, self.v, self.lane
+        self.time_since_lane_change += DT
+        ready = self.time_since_lane_change >= LANE_CHANGE_COOLDOWN
+
+        # Need to exit soon -> move right
+        need_exit = (self.exit_pos - x) <= EXIT_MERGE_START
+        go_right = ready & need_exit & (lane < self.n_lanes - 1)
+
+        # Otherwise pass if stuck, picking the side with more room (left wins ties)
+        has_front, _, gap = self.leaders(index)
+        # Taken in sorted (lane, x) order so the neighbour-lane searchsorted queries are
+        # sorted too, which is a lot faster than random lookups
+        order = index[1]
+        stuck = order[(ready & ~go_right & has_front & (gap < v * self.safe_time_headway * 0.9))[order]]
+        sl, sx = lane[stuck], x[stuck]
+        can_left = sl > 0
+        can_right = sl < self.n_lanes - 1
+        room_left = np.minimum(self.front_of(index, sl - 1, sx)[2], self.back_of(index, sl - 1, sx)[2])
+        room_right = np.minimum(self.front_of(index, sl + 1, sx)[2], self.back_of(index, sl + 1, sx)[2])
+        pass_right = can_right & (~can_left | (room_right > room_left))
+        pass_left = can_left & ~pass_right
+
+        direction = go_right.astype(np.int64)
+        direction[stuck] = np.where(pass_right, 1, np.where(pass_left, -1, 0))
+        movers = np.flatnonzero(direction)
+        if len(movers) == 0:
+            return
+        target = lane[movers] + direction[movers]
+        mx, mv = x[movers], v[movers]
+
+        # Safety check: need gaps ahead/behind in the target lane
+        _, _, gap_ahead = self.front_of(index, target, mx)
+        has_back, back, gap_behind = self.back_of(index, target, mx)
+        need_ahead = np.maximum(LANE_CHANGE_LOOK_AHEAD, mv * 0.6)
+        need_behind = np.maximum(LANE_CHANGE_LOOK_BACK, np.where(has_back, v[back] * 0.5, 0.0))
+        ok = (gap_ahead >= need_ahead) & (gap_behind >= need_behind)
+        movers, target, need_ahead = movers[ok], target[ok], need_ahead[ok]
+
+        # Resolve movers that picked overlapping spots in the same lane, front to back.
+        # There are only ever a handful of these per step, so a plain loop is fine.
+        accepted = []
+        last_lane, last_x = -1, 0.0
+        for k in np.lexsort((-x[movers], target)):
+            i = movers[k]
+            if target[k] == last_lane and (last_x - x[i]) < max(need_ahead[k], LANE_CHANGE_LOOK_BACK, v[i] * 0.5):
+                continue
+            accepted.append(k)
+            last_lane, last_x = target[k], x[i]
+        accepted = np.array(accepted, dtype=np.int64)
+        self.lane[movers[accepted]] = target[accepted]
+        self.time_since_lane_change[movers[accepted]] = 0.0
+
+    def desired_accel(self, index):
+        x, v = self.x, self.v
+        has_front, _, gap = self.leaders(index)
+        desired_gap = np.maximum(MIN_GAP, v * self.safe_time_headway + CAR_LENGTH_M)
+        accel = MAX_ACCEL * (1.0 - v / np.maximum(1e-3, self.desired_speed))
+        # If we are too close, brake harder the closer we are
+        too_close = has_front & (gap < desired_gap)
+        deficit = (desired_gap - gap) / np.maximum(desired_gap, 1.0)
+        accel = np.where(too_close, accel - MAX_DECEL * (0.5 + 1.5 * deficit), accel)
+        return np.clip(accel, -MAX_DECEL, MAX_ACCEL)
+
+    def step(self):
+        if self.paused:
+            return
+
+        self.spawn_accumulator += self.spawn_rate * DT
+        spawns = int(self.spawn_accumulator)
+        self.spawn_accumulator -= spawns
+        if spawns:
+            self.spawn_cars(spawns)
+
+        if len(self.x):
+            # Lane changes only reorder cars between lanes, so re-sort for the accel pass
+            self.lane_change_decisions(self.sorted_index())
+            self.a = self.desired_accel(self.sorted_index())
+            self.v = np.clip(self.v + self.a * DT, MIN_SPEED * 0.25, MAX_SPEED)
+            prev_x, self.x = self.x, self.x + self.v * DT
+            for det in self.detectors:
+                det.observe(prev_x, self.x, self.v)
+
+        self.remove_exited_or_finished()
+        self.time += DT
+
+    # --------- Rendering ----------
+    def draw(self, surf: pygame.Surface, font):
+        draw_road(surf, self.n_lanes)
+
+        w = max(6, int(CAR_LENGTH_M * PX_PER_M))
+        h = LANE_HEIGHT_PX - 12
+        xs = (MARGIN_PX + (self.x * PX_PER_M).astype(int) - w // 2).tolist()
+        ys = (MARGIN_PX + self.lane * LANE_HEIGHT_PX + 6).tolist()
+        if self.show_velocity_colors:
+            t = np.clip((self.v - 10.0) / (MAX_SPEED - 10.0), 0.0, 1.0)[:, None]
+            cols = (np.array(SLOW_COLOR) * (1 - t) + np.array(FAST_COLOR) * t).astype(int).tolist()
+        else:
+            cols = [CAR_COLOR] * len(xs)
+        notch = (((self.exit_pos - self.x) <= EXIT_MERGE_START) & (self.lane != self.n_lanes - 1)).tolist()
+        for x_px, y_top, col, exiting in zip(xs, ys, cols, notch):
+            pygame.draw.rect(surf, col, (x_px, y_top, w, h), border_radius=6)
+            if exiting:
+                pygame.draw.rect(surf, (230, 230, 60), (x_px + w - 4, y_top + h // 2 - 4, 4, 8))
+
+        draw_hud(surf, font, self.time, len(self.x), self.spawn_rate)
+
+
+def draw_road(surf: pygame.Surface, lanes: int = LANES):
+    surf.fill(BG)
+    road_bottom = MARGIN_PX + lanes * LANE_HEIGHT_PX
+
+    # Lanes
+    for i in range(lanes):
+        y = MARGIN_PX + i * LANE_HEIGHT_PX
+        pygame.draw.rect(surf, LANE_COLOR, (MARGIN_PX, y, SCREEN_W - 2 * MARGIN_PX, LANE_HEIGHT_PX), border_radius=10)
+
+    # Exits (draw dashed vertical markers, and a "merge" triangle into rightmost lane)
+    for ex in EXITS_M:
+        x_px = MARGIN_PX + int(ex * PX_PER_M)
+        pygame.draw.line(surf, EXIT_COLOR, (x_px, MARGIN_PX), (x_px, road_bottom), 2)
+        # shaded merge region for last 1 km before exit on rightmost lane
+        x0 = MARGIN_PX + int(max(0, (ex - EXIT_MERGE_START)) * PX_PER_M)
+        y_top = road_bottom - LANE_HEIGHT_PX
+        pygame.draw.polygon(surf, (30, 30, 35),
+                            [(x0, y_top),
+                             (x_px, y_top),
+                             (x_px, y_top + LANE_HEIGHT_PX)],
+                            0)
+
+
+def draw_hud(surf: pygame.Surface, font, t: float, n_cars: int, spawn_rate: float):
+    hud_lines = [
+        f"t = {t:6.1f}s",
+        f"cars = {n_cars}",
+        f"spawn = {spawn_rate:.2f} cars/s  ([ / ] to change)",
+        "P pause | R reset | V velocity colors | ESC quit",
+    ]
+    y = 6
+    for line in hud_lines:
+        txt = font.render(line, True, TEXT)
+        surf.blit(txt, (8, y))
+        y += txt.get_height() + 2
 
 
 def reset_world():
+    if USE_ARRAYS:
+        return ArrayHighway()
     return Highway()
 
 
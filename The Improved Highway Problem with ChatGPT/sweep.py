@@ -0,0 +1,155 @@
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from main import ArrayHighway, DT, LANES, SAFE_TIME_HEADWAY
+
+# Fundamental-diagram sweep: independent ArrayHighway replicates over a grid of spawn
+# rates, lane counts and headways, run on a process pool. Each finished cell is appended
+# to OUTPUT straight away, and cells already in OUTPUT are skipped on start-up, so a
+# crashed or interrupted sweep just picks up where it left off when you run it again.
+
+SPAWN_RATES = [0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 2.5, 3.0, 4.0, 5.0]
+LANE_COUNTS = [2, LANES, 4]
+HEADWAYS = [0.8, SAFE_TIME_HEADWAY, 1.8]
+REPLICATES = 4
+SIM_S = 3600          # sim time per replicate
+WARMUP_S = 600        # trips that start before this are ignored (road still filling up)
+DRAIN_MAX_S = 3600    # after SIM_S, run at most this much longer for trips started before it to finish
+ROOT_SEED = 2024
+OUTPUT = "sweep_results.csv"
+MAX_POOL_RESTARTS = 3
+
+KEY = ["spawn_rate", "lanes", "headway", "replicate"]
+COLUMNS = KEY + ["trips", "censored", "throughput_veh_h", "tt_p50_s", "tt_p90_s", "tt_p95_s", "tt_p99_s",
+                 "trip_speed_mean", "cars_on_road_end", "wall_s"]
+
+
+def cell_seed(spawn_rate: float, lanes: int, headway: float, replicate: int) -> np.random.SeedSequence:
+    # Every cell gets its own RNG stream, derived only from the cell itself, so results
+    # don't depend on which worker ran it or in what order
+    return np.random.SeedSequence([ROOT_SEED, round(spawn_rate * 1000), lanes, round(headway * 1000), replicate])
+
+
+def run_cell(cell: tuple[float, int, float, int]) -> dict:
+    spawn_rate, lanes, headway, replicate = cell
+    start = time.perf_counter()
+    world = ArrayHighway(lanes=lanes, spawn_rate=spawn_rate, safe_time_headway=headway,
+                         seed=cell_seed(spawn_rate, lanes, headway, replicate))
+    world.record_trips = True
+    for _ in range(round(SIM_S / DT)):
+        world.step()
+    cars_on_road_end = len(world)
+
+    # The trips started in [WARMUP_S, SIM_S) that are still on the road now are the slow
+    # ones. Dropping them would cut the travel times off at about SIM_S - WARMUP_S in just
+    # the congested cells, so the sim carries on (same demand, so the same conditions)
+    # until they've all left, or DRAIN_MAX_S runs out and the rest are counted as censored
+    # (in a cell with censored trips the percentiles are lower bounds)
+    def cohort_on_road() -> int:
+        return int(np.count_nonzero((world.spawn_time >= WARMUP_S) & (world.spawn_time < SIM_S)))
+
+    for _ in range(round(DRAIN_MAX_S / DT)):
+        if not cohort_on_road():
+            break
+        world.step()
+
+    if world.trips:
+        spawned, travel, dist = (np.concatenate(col) for col in zip(*world.trips))
+    else:
+        spawned = travel = dist = np.zeros(0)
+    # Throughput counts every car that left during the window, whenever it started
+    exited = spawned + travel
+    left_in_window = np.count_nonzero((exited >= WARMUP_S) & (exited <= SIM_S))
+    cohort = (spawned >= WARMUP_S) & (spawned < SIM_S)
+    travel, dist = travel[cohort], dist[cohort]
+
+    row = dict(zip(KEY, cell))
+    row["trips"] = len(travel)
+    row["censored"] = cohort_on_road()
+    row["throughput_veh_h"] = left_in_window / (SIM_S - WARMUP_S) * 3600
+    if len(travel):
+        p50, p90, p95, p99 = np.percentile(travel, [50, 90, 95, 99])
+        row.update(tt_p50_s=round(p50, 2), tt_p90_s=round(p90, 2), tt_p95_s=round(p95, 2), tt_p99_s=round(p99, 2),
+                   trip_speed_mean=round(float((dist / travel).mean()), 3))
+    else:
+        row.update(tt_p50_s="", tt_p90_s="", tt_p95_s="", tt_p99_s="", trip_speed_mean="")
+    row["cars_on_road_end"] = cars_on_road_end
+    row["wall_s"] = round(time.perf_counter() - start, 2)
+    return row
+
+
+def read_rows(path: str) -> list[dict]:
+    # Rows half-written by a crash are missing fields, so they're dropped (and get rerun)
+    if not os.path.exists(path):
+        return []
+    with open(path, newline="") as f:
+        return [row for row in csv.DictReader(f) if all(row.get(c) is not None for c in COLUMNS) and row["wall_s"]]
+
+
+def cell_of(row: dict) -> tuple[float, int, float, int]:
+    return float(row["spawn_rate"]), int(row["lanes"]), float(row["headway"]), int(row["replicate"])
+
+
+if __name__ == "__main__":
+    cells = list(itertools.product(SPAWN_RATES, LANE_COUNTS, HEADWAYS, range(REPLICATES)))
+    if os.path.exists(OUTPUT):
+        with open(OUTPUT, newline="") as f:
+            header = next(csv.reader(f), None)
+        if header != COLUMNS:
+            # Written by an older version with different columns: keep it, but start over
+            os.replace(OUTPUT, OUTPUT + ".old")
+            print(f"{OUTPUT} has old columns, moved it to {OUTPUT}.old")
+    done = {cell_of(row) for row in read_rows(OUTPUT)}
+    todo = [c for c in cells if c not in done]
+    print(f"{len(cells)} cells, {len(done)} already in {OUTPUT}, {len(todo)} to run on {os.cpu_count()} cores")
+
+    new_file = not os.path.exists(OUTPUT)
+    if not new_file:
+        # Make sure a row cut off mid-write doesn't get glued onto the next one
+        with open(OUTPUT, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() and (f.seek(-1, os.SEEK_END), f.read(1))[1] != b"\n":
+                f.write(b"\n")
+    with open(OUTPUT, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        if new_file:
+            writer.writeheader()
+
+        start = time.perf_counter()
+        restarts = 0
+        while todo:
+            try:
+                with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+                    futures = {pool.submit(run_cell, c): c for c in todo}
+                    for fut in as_completed(futures):
+                        row = fut.result()
+                        writer.writerow(row)
+                        f.flush()
+                        todo.remove(futures[fut])
+                        print(f"{len(cells) - len(todo)}/{len(cells)}  rate={row['spawn_rate']} lanes={row['lanes']} "
+                              f"headway={row['headway']} rep={row['replicate']}  ({time.perf_counter() - start:.0f}s)")
+            except BrokenProcessPool:
+                # A worker died (OOM, killed...). Finished cells are already on disk, so just
+                # start a fresh pool for what's left.
+                restarts += 1
+                if restarts > MAX_POOL_RESTARTS:
+                    raise
+                print(f"Worker pool crashed, restarting ({restarts}/{MAX_POOL_RESTARTS}) with {len(todo)} cells left")
+
+    # Aggregate over replicates
+    groups: dict[tuple[float, int, float], list[dict]] = {}
+    for row in read_rows(OUTPUT):
+        groups.setdefault(cell_of(row)[:3], []).append(row)
+
+    print(f"\n{'rate':>5} {'lanes':>5} {'headway':>7} {'reps':>4} {'veh/h':>8} {'tt p50':>7} {'tt p95':>7} {'censored':>8}")
+    for (rate, lanes, headway), rows in sorted(groups.items()):
+        throughput = np.mean([float(r["throughput_veh_h"]) for r in rows])
+        p50 = np.mean([float(r["tt_p50_s"]) for r in rows if r["tt_p50_s"]] or [np.nan])
+        p95 = np.mean([float(r["tt_p95_s"]) for r in rows if r["tt_p95_s"]] or [np.nan])
+        censored = sum(int(r["censored"]) for r in rows)
+        print(f"{rate:>5} {lanes:>5} {headway:>7} {len(rows):>4} {throughput:>8.0f} {p50:>7.0f} {p95:>7.0f} "
+              f"{censored:>8}")